@@ -3,7 +3,7 @@
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Iterator
 from datetime import datetime
 from zhdate import ZhDate
 
@@ -13,6 +13,22 @@ from src.group import GroupManager
 from src.utils.advanced_analysis import AdvancedAnalysisEngine
 from src.utils.config import Config
 
+# 金额格式化函数（预先绑定，避免在循环中重复构造格式串）
+_format_amount_yuan = '{:,.0f}元'.format
+
+
+def _flatten_dict(d: Dict, parent_key: str = '', sep: str = '_') -> Dict:
+    """将嵌套字典展平为单层字典，键名以分隔符连接"""
+    items = {}
+    for k, v in d.items():
+        new_key = f"{parent_key}{sep}{k}" if parent_key else k
+        if isinstance(v, dict):
+            items.update(_flatten_dict(v, new_key, sep=sep))
+        else:
+            items[new_key] = v
+    return items
+
+
 class BankAnalyzer(BaseAnalyzer):
     """
     银行数据分析器，用于分析银行交易数据
@@ -282,30 +298,12 @@ class BankAnalyzer(BaseAnalyzer):
         """
         rows = []
 
-        def flatten_dict(d, parent_key='', sep='_'):
-            items = []
-            for k, v in d.items():
-                new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                if isinstance(v, dict):
-                    items.extend(flatten_dict(v, new_key, sep=sep).items())
-                else:
-                    items.append((new_key, v))
-            return dict(items)
-
-        flattened = flatten_dict(data_dict)
+        flattened = _flatten_dict(data_dict)
 
         for key, value in flattened.items():
             # 解析键名并转换为通俗易懂的名称
-            if '_' in key:
-                parts = key.split('_')
-                if len(parts) >= 2:
-                    dimension_key = parts[0]
-                    metric_key = '_'.join(parts[1:])
-                else:
-                    dimension_key = key
-                    metric_key = '值'
-            else:
-                dimension_key = key
+            dimension_key, sep, metric_key = key.partition('_')
+            if not sep:
                 metric_key = '值'
 
             # 转换为通俗易懂的名称
@@ -675,17 +673,7 @@ class BankAnalyzer(BaseAnalyzer):
         """默认转换方式"""
         rows = []
 
-        def flatten_dict(d, parent_key='', sep='_'):
-            items = []
-            for k, v in d.items():
-                new_key = f"{parent_key}{sep}{k}" if parent_key else k
-                if isinstance(v, dict):
-                    items.extend(flatten_dict(v, new_key, sep=sep).items())
-                else:
-                    items.append((new_key, v))
-            return dict(items)
-
-        flattened = flatten_dict(data_dict)
+        flattened = _flatten_dict(data_dict)
 
         for key, value in flattened.items():
             rows.append({
@@ -698,8 +686,14 @@ class BankAnalyzer(BaseAnalyzer):
 
     def _format_anomaly_data(self, anomalies: list) -> pd.DataFrame:
         """格式化异常检测数据"""
-        formatted_rows = []
+        return pd.DataFrame(list(self._iter_anomaly_rows(anomalies)))
+
+    def _iter_anomaly_rows(self, anomalies: list) -> Iterator[Dict]:
+        """
+        逐行生成格式化后的异常检测数据
 
+        直接写入Excel等场景可遍历此生成器，跳过中间DataFrame的构建
+        """
         for i, anomaly in enumerate(anomalies, 1):
             anomaly_type = anomaly.get('type', '未知异常')
             person = anomaly.get('person', '未知')
@@ -709,49 +703,48 @@ class BankAnalyzer(BaseAnalyzer):
             if anomaly_type == '高频交易':
                 count = anomaly.get('count', 0)
                 risk_level = '高' if count > 20 else '中' if count > 15 else '低'
-                formatted_rows.append({
+                yield {
                     '序号': i,
                     '异常类型': '高频交易异常',
                     '涉及人员': person,
                     '异常详情': f'交易次数: {count}次',
                     '风险等级': risk_level,
                     '说明': '短时间内交易次数过多，可能存在异常操作'
-                })
+                }
             elif anomaly_type == '金额异常':
                 amounts = anomaly.get('outlier_amounts', [])
-                amounts_str = ', '.join([f'{amt:,.0f}元' for amt in amounts[:3]])
-                if len(amounts) > 3:
-                    amounts_str += f' 等{len(amounts)}笔'
-                formatted_rows.append({
+                amount_count = len(amounts)
+                amounts_str = ', '.join(map(_format_amount_yuan, amounts[:3]))
+                if amount_count > 3:
+                    amounts_str += f' 等{amount_count}笔'
+                yield {
                     '序号': i,
                     '异常类型': '金额异常',
                     '涉及人员': person,
                     '异常详情': f'异常金额: {amounts_str}',
                     '风险等级': '高',
                     '说明': '交易金额偏离个人历史平均值过大'
-                })
+                }
             elif anomaly_type == '时间间隔异常':
                 intervals = anomaly.get('short_intervals', [])
                 min_interval = min(intervals) if intervals else 0
-                formatted_rows.append({
+                yield {
                     '序号': i,
                     '异常类型': '时间间隔异常',
                     '涉及人员': person,
                     '异常详情': f'最短间隔: {min_interval:.1f}小时',
                     '风险等级': '中',
                     '说明': '连续交易时间间隔过短，可能是批量操作'
-                })
+                }
             else:
-                formatted_rows.append({
+                yield {
                     '序号': i,
                     '异常类型': anomaly_type,
                     '涉及人员': person,
                     '异常详情': description,
                     '风险等级': '待评估',
                     '说明': '需要进一步分析的异常模式'
-                })
-
-        return pd.DataFrame(formatted_rows)
+                }
 
     def _format_pattern_data(self, person_patterns: dict) -> pd.DataFrame:
         """格式化个人交易模式数据"""
@@ -90,7 +90,7 @@ class PaymentAnalyzer(BaseAnalyzer):
             分析结果
         """
         results = {}
-        source_data = self.payment_model.data[self.payment_model.data[ColumnName.DATA_SOURCE] == source_name]
+        source_data = self.payment_model.data[self.payment_model.data[ColumnName.DATA_SOURCE.value] == source_name]
 
         if source_data.empty:
             self.logger.warning(f"找不到数据来源 '{source_name}' 的数据")
@@ -149,8 +149,8 @@ class PaymentAnalyzer(BaseAnalyzer):
         # 定义分组键和聚合操作
         group_cols = [name_col, opposite_name_col]
         agg_dict = {
-            ColumnName.INCOME_AMOUNT: 'sum',
-            ColumnName.EXPENSE_AMOUNT: 'sum',
+            ColumnName.INCOME_AMOUNT.value: 'sum',
+            ColumnName.EXPENSE_AMOUNT.value: 'sum',
             self.payment_model.amount_column: 'count'
         }
         
@@ -160,8 +160,8 @@ class PaymentAnalyzer(BaseAnalyzer):
         # 重命名列
         rename_dict = {
             self.payment_model.amount_column: '交易次数',
-            ColumnName.INCOME_AMOUNT: '总收入',
-            ColumnName.EXPENSE_AMOUNT: '总支出'
+            ColumnName.INCOME_AMOUNT.value: '总收入',
+            ColumnName.EXPENSE_AMOUNT.value: '总支出'
         }
         result.rename(columns=rename_dict, inplace=True)
 
@@ -189,7 +189,7 @@ class PaymentAnalyzer(BaseAnalyzer):
         result = pd.merge(result, time_span[group_cols + ['交易时间跨度']], on=group_cols, how='left')
 
         # 添加数据来源
-        result[ColumnName.DATA_SOURCE] = data[ColumnName.DATA_SOURCE].iloc[0]
+        result[ColumnName.DATA_SOURCE.value] = data[ColumnName.DATA_SOURCE.value].iloc[0]
         
         return result.sort_values(by=[name_col, '交易总金额'], ascending=[True, False])
 
@@ -393,5 +393,5 @@ class PaymentAnalyzer(BaseAnalyzer):
         if data.empty:
             return pd.DataFrame()
             
-        sort_col = ColumnName.INCOME_AMOUNT if by_income else ColumnName.EXPENSE_AMOUNT
+        sort_col = ColumnName.INCOME_AMOUNT.value if by_income else ColumnName.EXPENSE_AMOUNT.value
         return data.nlargest(top_n, sort_col)
\ No newline at end of file
@@ -4,12 +4,32 @@
 import pandas as pd
 from abc import ABC, abstractmethod
 import logging
-from typing import List
+from typing import List, Callable
+
+
+class _LazyData:
+    """
+    data属性的延迟加载描述符
+
+    非数据描述符：实例字典中已有data时直接命中实例属性，不经过描述符；
+    只有通过set_data_loader设置了加载函数且尚未加载时，才在首次访问时调用加载函数
+    """
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        loader = obj.__dict__.pop('_data_loader', None)
+        if loader is None:
+            raise AttributeError(f"'{type(obj).__name__}' object has no attribute 'data'")
+        data = obj.__dict__['data'] = loader()
+        return data
+
 
 class BaseDataModel(ABC):
     """
     数据模型基类，所有数据源模型都应继承此类
     """
+    data = _LazyData()
+
     def __init__(self, data_path=None, data=None):
         """
         初始化数据模型
@@ -43,6 +63,18 @@ class BaseDataModel(ABC):
             self.remove_duplicates()
             self.preprocess()
     
+    def set_data_loader(self, loader: Callable[[], pd.DataFrame]):
+        """
+        设置数据的延迟加载函数，首次访问data时才调用加载函数
+        
+        Parameters:
+        -----------
+        loader : Callable[[], pd.DataFrame]
+            返回数据的无参函数
+        """
+        self.__dict__.pop('data', None)
+        self.__dict__['_data_loader'] = loader
+    
     def get_data_sources(self) -> List[str]:
         """
         获取数据中所有的数据来源
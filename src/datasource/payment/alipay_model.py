@@ -29,7 +29,7 @@ class AlipayDataModel(PaymentDataModel):
             配置对象，如果不提供则使用默认配置
         """
         # 调用父类初始化，指定数据源类型
-        super().__init__(data_path, data, config, DataSourceType.ALIPAY)
+        super().__init__(data_path, data, config, DataSourceType.ALIPAY.value)
         
         # 支付宝特有的借贷标识 (父类已经设置，但这里重写以确保正确值)
         self.credit_flag = self.config.get('data_sources.alipay.credit_flag', '收入')  # 收入
@@ -50,8 +50,8 @@ class AlipayDataModel(PaymentDataModel):
             # 例如，忽略已退款、已撤销的交易
             cancelled_mask = self.data[self.transaction_status_column].isin(['已退款', '已撤销', '交易关闭'])
             if cancelled_mask.any():
-                self.data.loc[cancelled_mask, ColumnName.INCOME_AMOUNT] = 0
-                self.data.loc[cancelled_mask, ColumnName.EXPENSE_AMOUNT] = 0
+                self.data.loc[cancelled_mask, ColumnName.INCOME_AMOUNT.value] = 0
+                self.data.loc[cancelled_mask, ColumnName.EXPENSE_AMOUNT.value] = 0
                 self.logger.info(f"已将 {cancelled_mask.sum()} 条已取消的交易收支金额设为0")
         
         self.logger.info("支付宝特有的数据预处理完成") 
\ No newline at end of file
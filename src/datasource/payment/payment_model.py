@@ -42,14 +42,14 @@ class PaymentDataModel(BaseDataModel):
         config_prefix = f'data_sources.{self.data_source_type}'
         
         # 定义通用列名配置
-        self.name_column = self.config.get(f'{config_prefix}.name_column', ColumnName.NAME)
-        self.date_column = self.config.get(f'{config_prefix}.date_column', ColumnName.DATE)
+        self.name_column = self.config.get(f'{config_prefix}.name_column', ColumnName.NAME.value)
+        self.date_column = self.config.get(f'{config_prefix}.date_column', ColumnName.DATE.value)
         self.time_column = self.config.get(f'{config_prefix}.time_column', '交易时间')
-        self.amount_column = self.config.get(f'{config_prefix}.amount_column', ColumnName.AMOUNT)
-        self.balance_column = self.config.get(f'{config_prefix}.balance_column', ColumnName.BALANCE)
-        self.direction_column = self.config.get(f'{config_prefix}.direction_column', ColumnName.DIRECTION)
-        self.opposite_name_column = self.config.get(f'{config_prefix}.opposite_name_column', ColumnName.OPPOSITE_NAME)
-        self.special_date_column = self.config.get(f'{config_prefix}.special_date_column', ColumnName.SPECIAL_DATE)
+        self.amount_column = self.config.get(f'{config_prefix}.amount_column', ColumnName.AMOUNT.value)
+        self.balance_column = self.config.get(f'{config_prefix}.balance_column', ColumnName.BALANCE.value)
+        self.direction_column = self.config.get(f'{config_prefix}.direction_column', ColumnName.DIRECTION.value)
+        self.opposite_name_column = self.config.get(f'{config_prefix}.opposite_name_column', ColumnName.OPPOSITE_NAME.value)
+        self.special_date_column = self.config.get(f'{config_prefix}.special_date_column', ColumnName.SPECIAL_DATE.value)
         
         # 借贷标识
         self.credit_flag = self.config.get(f'{config_prefix}.credit_flag', '收入')  # 收入
@@ -105,13 +105,13 @@ class PaymentDataModel(BaseDataModel):
         self.add_income_expense_columns()
         
         # 添加数据来源列
-        if self.file_path and ColumnName.DATA_SOURCE not in self.data.columns:
+        if self.file_path and ColumnName.DATA_SOURCE.value not in self.data.columns:
             source_name = os.path.splitext(os.path.basename(self.file_path))[0]
-            self.data[ColumnName.DATA_SOURCE] = source_name
-            self.logger.info(f"已添加 '{ColumnName.DATA_SOURCE}' 列，值为 '{source_name}'")
-        elif ColumnName.DATA_SOURCE not in self.data.columns:
-            self.data[ColumnName.DATA_SOURCE] = f'{self.data_source_type}数据'  # 默认值
-            self.logger.info(f"未找到文件路径，添加 '{ColumnName.DATA_SOURCE}' 列，值为 '{self.data_source_type}数据'")
+            self.data[ColumnName.DATA_SOURCE.value] = source_name
+            self.logger.info(f"已添加 '{ColumnName.DATA_SOURCE.value}' 列，值为 '{source_name}'")
+        elif ColumnName.DATA_SOURCE.value not in self.data.columns:
+            self.data[ColumnName.DATA_SOURCE.value] = f'{self.data_source_type}数据'  # 默认值
+            self.logger.info(f"未找到文件路径，添加 '{ColumnName.DATA_SOURCE.value}' 列，值为 '{self.data_source_type}数据'")
         
         self.logger.info(f"{self.data_source_type}数据预处理完成")
     
@@ -122,8 +122,8 @@ class PaymentDataModel(BaseDataModel):
         此方法可能会被子类覆盖，以适应不同的数据格式
         """
         # 初始化收入和支出列
-        self.data[ColumnName.INCOME_AMOUNT] = 0.0
-        self.data[ColumnName.EXPENSE_AMOUNT] = 0.0
+        self.data[ColumnName.INCOME_AMOUNT.value] = 0.0
+        self.data[ColumnName.EXPENSE_AMOUNT.value] = 0.0
         
         # 根据借贷标识和交易金额填充收入和支出金额
         processed_with_direction = False
@@ -137,11 +137,11 @@ class PaymentDataModel(BaseDataModel):
             if income_mask.any() or expense_mask.any():
                 # 处理收入金额
                 if income_mask.any():
-                    self.data.loc[income_mask, ColumnName.INCOME_AMOUNT] = self.data.loc[income_mask, self.amount_column].abs()
+                    self.data.loc[income_mask, ColumnName.INCOME_AMOUNT.value] = self.data.loc[income_mask, self.amount_column].abs()
                 
                 # 处理支出金额
                 if expense_mask.any():
-                    self.data.loc[expense_mask, ColumnName.EXPENSE_AMOUNT] = self.data.loc[expense_mask, self.amount_column].abs()
+                    self.data.loc[expense_mask, ColumnName.EXPENSE_AMOUNT.value] = self.data.loc[expense_mask, self.amount_column].abs()
                 
                 processed_with_direction = True
         
@@ -155,12 +155,12 @@ class PaymentDataModel(BaseDataModel):
             
             # 处理收入金额
             if income_mask.any():
-                self.data.loc[income_mask, ColumnName.INCOME_AMOUNT] = self.data.loc[income_mask, self.amount_column]
+                self.data.loc[income_mask, ColumnName.INCOME_AMOUNT.value] = self.data.loc[income_mask, self.amount_column]
             
             # 处理支出金额
             if expense_mask.any():
                 # 取绝对值，确保金额为正数
-                self.data.loc[expense_mask, ColumnName.EXPENSE_AMOUNT] = self.data.loc[expense_mask, self.amount_column].abs()
+                self.data.loc[expense_mask, ColumnName.EXPENSE_AMOUNT.value] = self.data.loc[expense_mask, self.amount_column].abs()
     
     def get_persons(self) -> List[str]:
         """
@@ -240,7 +240,7 @@ class PaymentDataModel(BaseDataModel):
             收入数据
         """
         # 收入条件
-        income_mask = self.data[ColumnName.INCOME_AMOUNT] > 0
+        income_mask = self.data[ColumnName.INCOME_AMOUNT.value] > 0
         
         # 如果提供了人名，再按人名筛选
         if person_name:
@@ -264,7 +264,7 @@ class PaymentDataModel(BaseDataModel):
             支出数据
         """
         # 支出条件
-        expense_mask = self.data[ColumnName.EXPENSE_AMOUNT] > 0
+        expense_mask = self.data[ColumnName.EXPENSE_AMOUNT.value] > 0
         
         # 如果提供了人名，再按人名筛选
         if person_name:
@@ -299,14 +299,14 @@ class PaymentDataModel(BaseDataModel):
         group_by = [self.opposite_name_column]
         
         # 统计收入
-        income_stats = data_to_analyze[data_to_analyze[ColumnName.INCOME_AMOUNT] > 0].groupby(group_by).agg({
-            ColumnName.INCOME_AMOUNT: ['count', 'sum', 'mean'],
+        income_stats = data_to_analyze[data_to_analyze[ColumnName.INCOME_AMOUNT.value] > 0].groupby(group_by).agg({
+            ColumnName.INCOME_AMOUNT.value: ['count', 'sum', 'mean'],
             self.date_column: ['min', 'max']
         })
         
         # 统计支出
-        expense_stats = data_to_analyze[data_to_analyze[ColumnName.EXPENSE_AMOUNT] > 0].groupby(group_by).agg({
-            ColumnName.EXPENSE_AMOUNT: ['count', 'sum', 'mean'],
+        expense_stats = data_to_analyze[data_to_analyze[ColumnName.EXPENSE_AMOUNT.value] > 0].groupby(group_by).agg({
+            ColumnName.EXPENSE_AMOUNT.value: ['count', 'sum', 'mean'],
             self.date_column: ['min', 'max']
         })
         
@@ -348,7 +348,7 @@ class PaymentDataModel(BaseDataModel):
         List[str]
             所有数据源名称列表
         """
-        if ColumnName.DATA_SOURCE not in self.data.columns:
+        if ColumnName.DATA_SOURCE.value not in self.data.columns:
             return []
         
-        return self.data[ColumnName.DATA_SOURCE].dropna().unique().tolist() 
\ No newline at end of file
+        return self.data[ColumnName.DATA_SOURCE.value].dropna().unique().tolist() 
\ No newline at end of file
@@ -29,7 +29,7 @@ class WeChatDataModel(PaymentDataModel):
             配置对象，如果不提供则使用默认配置
         """
         # 调用父类初始化，指定数据源类型
-        super().__init__(data_path, data, config, DataSourceType.WECHAT)
+        super().__init__(data_path, data, config, DataSourceType.WECHAT.value)
         
         # 微信特有的借贷标识 (父类已经设置，但这里重写以确保正确值)
         self.credit_flag = self.config.get('data_sources.wechat.credit_flag', '入')  # 收入
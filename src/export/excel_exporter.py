@@ -4,7 +4,7 @@
 import pandas as pd
 import os
 import logging
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, Tuple, Callable
 import xlsxwriter
 from datetime import datetime
 import numpy as np
@@ -35,6 +35,9 @@ class ExcelExporter(BaseExporter):
         self.config = config or Config()
         self.excel_config = self.config.get_section('export.excel')
         
+        # 综合分析中各交叉分析共用的预聚合结果缓存，见 _cached_aggregate
+        self._aggregate_cache: Dict[tuple, tuple] = {}
+        
     def export(self, analysis_results: Dict[str, pd.DataFrame], filename: str, 
               data_models: Optional[Dict[str, BaseDataModel]] = None, **kwargs) -> str:
         """
@@ -764,6 +767,10 @@ class ExcelExporter(BaseExporter):
         combined_call_df = pd.concat(call_frequency_dfs, ignore_index=True) if call_frequency_dfs else pd.DataFrame()
         combined_bill_df = pd.concat(bill_frequency_dfs, ignore_index=True) if bill_frequency_dfs else pd.DataFrame()
 
+        # 姓名列在后续交叉分析中被反复分组和合并，先转换为category，以整数编码代替字符串哈希
+        combined_call_df = self._categorize_keys(combined_call_df)
+        combined_bill_df = self._categorize_keys(combined_bill_df)
+
         comprehensive_results = []
 
         # 1. 以话单为基准的交叉分析（如果有话单和账单数据）
@@ -786,6 +793,9 @@ class ExcelExporter(BaseExporter):
             if platform_based_analysis:
                 comprehensive_results.extend(platform_based_analysis)
 
+        # 预聚合结果只在本次综合分析内复用
+        self._aggregate_cache.clear()
+
         # 合并并导出综合分析结果
         if comprehensive_results:
             final_comprehensive_df = pd.concat(comprehensive_results, ignore_index=True)
@@ -800,50 +810,24 @@ class ExcelExporter(BaseExporter):
 
             self.logger.info("已生成综合分析表")
 
+    def _categorize_keys(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        将本方姓名、对方姓名列转换为category类型（分组时须使用observed=True）
+        
+        平台列保持原类型：其聚合结果（如'、'拼接的平台列表）会被转换回category，
+        之后填充'无'等新值时将报错。
+        """
+        key_columns = [col for col in ('本方姓名', '对方姓名') if col in df.columns]
+        if not key_columns:
+            return df
+        return df.astype({col: 'category' for col in key_columns})
+
     def _cross_analyze_with_call_base(self, call_df: pd.DataFrame, bill_df: pd.DataFrame) -> pd.DataFrame:
         """以话单为基准进行交叉分析，支持跨数据源对手信息显示"""
         # 以话单数据为基础，不创建额外组合
 
-        # 基于对方姓名进行匹配，并计算各平台的金额分布
-        bill_platform_summary = bill_df.groupby(['本方姓名', '对方姓名', '平台']).agg({
-            '收入总额': 'sum',
-            '支出总额': 'sum',
-            '交易次数': 'sum'
-        }).reset_index()
-
-        # 计算总金额
-        bill_total_summary = bill_df.groupby(['本方姓名', '对方姓名']).agg({
-            '收入总额': 'sum',
-            '支出总额': 'sum',
-            '交易次数': 'sum',
-            '平台': lambda x: '、'.join(x.unique())
-        }).reset_index()
-
-        # 计算各平台的金额分布
-        platform_details = bill_platform_summary.groupby(['本方姓名', '对方姓名']).apply(
-            lambda group: self._format_platform_details(group)
-        ).reset_index(name='平台金额分布')
-
-        # 为每个平台创建独立字段
-        platform_individual_data = {}
-        if not bill_platform_summary.empty:
-            platforms = bill_platform_summary['平台'].unique()
-            for platform in platforms:
-                platform_data = bill_platform_summary[bill_platform_summary['平台'] == platform]
-                platform_summary = platform_data.groupby(['本方姓名', '对方姓名']).agg({
-                    '收入总额': 'sum',
-                    '支出总额': 'sum',
-                    '交易次数': 'sum'
-                }).reset_index()
-
-                # 重命名列以区分不同平台
-                platform_summary = platform_summary.rename(columns={
-                    '收入总额': f'{platform}_收入总额',
-                    '支出总额': f'{platform}_支出总额',
-                    '交易次数': f'{platform}_交易次数'
-                })
-
-                platform_individual_data[platform] = platform_summary
+        # 基于对方姓名进行匹配，计算总金额及各平台的金额分布（与以账单类为基准的分析共用）
+        bill_total_summary, platform_details, platform_individual_data = self._prepare_bill_aggregates(bill_df)
 
         # 合并总金额和平台详情
         if not bill_total_summary.empty and not platform_details.empty:
@@ -852,31 +836,7 @@ class ExcelExporter(BaseExporter):
             bill_summary_with_details = bill_total_summary.copy() if not bill_total_summary.empty else pd.DataFrame()
 
         # 获取话单中的对方详细信息
-        agg_dict = {
-            '通话次数': 'sum',
-            '数据来源': 'first'
-        }
-
-        # 检查通话时长列名
-        if '通话总时长(分钟)' in call_df.columns:
-            agg_dict['通话总时长(分钟)'] = 'sum'
-        elif '通话时长' in call_df.columns:
-            agg_dict['通话时长'] = 'sum'
-
-        # 安全地添加可选字段
-        if '对方号码' in call_df.columns:
-            agg_dict['对方号码'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        # 检查带lambda后缀的字段名（来自话单频率分析）
-        if '对方单位名称_<lambda>' in call_df.columns:
-            agg_dict['对方单位名称_<lambda>'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        elif '对方单位名称' in call_df.columns:
-            agg_dict['对方单位名称'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        if '对方职务_<lambda>' in call_df.columns:
-            agg_dict['对方职务_<lambda>'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        elif '对方职务' in call_df.columns:
-            agg_dict['对方职务'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-
-        call_details = call_df.groupby(['本方姓名', '对方姓名']).agg(agg_dict).reset_index()
+        call_details = self._prepare_call_aggregates(call_df, include_source=True)
 
         # 以话单数据为基础进行合并
         merged_df = call_details.copy()
@@ -891,39 +851,35 @@ class ExcelExporter(BaseExporter):
                 how='left'
             )
 
-        # 与各平台独立数据合并 - 严格匹配，禁止跨人员关联
-        for platform, platform_data in platform_individual_data.items():
-            # 只进行完全匹配（本方姓名+对方姓名），禁止跨人员匹配
-            merged_df = pd.merge(
-                merged_df,
-                platform_data,
-                on=['本方姓名', '对方姓名'],
-                how='left'
-            )
+        # 与各平台独立数据合并 - 只进行完全匹配（本方姓名+对方姓名），禁止跨人员关联
+        merged_df = self._attach_platform_columns(merged_df, platform_individual_data)
 
-        # 填充空值
-        merged_df['收入总额'] = merged_df['收入总额'].fillna(0)
-        merged_df['支出总额'] = merged_df['支出总额'].fillna(0)
-        merged_df['交易次数'] = merged_df['交易次数'].fillna(0)
-        merged_df['平台'] = merged_df['平台'].fillna('无')
-        merged_df['平台金额分布'] = merged_df['平台金额分布'].fillna('无')
+        # 填充空值（各列的填充值汇总为一个字典，最后一次性填充）
+        fill_values = {
+            '收入总额': 0,
+            '支出总额': 0,
+            '交易次数': 0,
+            '平台': '无',
+            '平台金额分布': '无'
+        }
 
         # 填充各平台的金额字段
-        for col in merged_df.columns:
-            if any(platform in col for platform in ['银行', '微信', '支付宝']) and any(field in col for field in ['收入总额', '支出总额', '交易次数']):
-                merged_df[col] = merged_df[col].fillna(0)
+        fill_values.update(dict.fromkeys(self._platform_numeric_columns(merged_df, platform_individual_data), 0))
 
         # 安全地填充可选字段的空值
         if '对方号码' in merged_df.columns:
-            merged_df['对方号码'] = merged_df['对方号码'].fillna('')
+            fill_values['对方号码'] = ''
         if '对方单位名称_<lambda>' in merged_df.columns:
-            merged_df['对方单位名称_<lambda>'] = merged_df['对方单位名称_<lambda>'].fillna('')
+            fill_values['对方单位名称_<lambda>'] = ''
         elif '对方单位名称' in merged_df.columns:
-            merged_df['对方单位名称'] = merged_df['对方单位名称'].fillna('')
+            fill_values['对方单位名称'] = ''
         if '对方职务_<lambda>' in merged_df.columns:
-            merged_df['对方职务_<lambda>'] = merged_df['对方职务_<lambda>'].fillna('')
+            fill_values['对方职务_<lambda>'] = ''
         elif '对方职务' in merged_df.columns:
-            merged_df['对方职务'] = merged_df['对方职务'].fillna('')
+            fill_values['对方职务'] = ''
+
+        # 一次性填充所有空值
+        merged_df.fillna(fill_values, inplace=True)
 
         # 重新排列列的顺序，将对方详细信息放在对方姓名后面
         base_columns = ['本方姓名', '对方姓名']
@@ -1053,7 +1009,7 @@ class ExcelExporter(BaseExporter):
         if '数据来源' in base_platform_df.columns:
             agg_dict['数据来源'] = 'first'
 
-        base_details = base_platform_df.groupby(['本方姓名', '对方姓名']).agg(agg_dict).reset_index()
+        base_details = base_platform_df.groupby(['本方姓名', '对方姓名'], observed=True).agg(agg_dict).reset_index()
 
         # 重命名基准平台的列以区分
         base_details = base_details.rename(columns={
@@ -1073,11 +1029,11 @@ class ExcelExporter(BaseExporter):
             # 为每个其他平台创建独立的汇总数据
             for platform in other_platforms:
                 platform_data = other_bill_platforms_df[other_bill_platforms_df['平台'] == platform]
-                platform_summary = platform_data.groupby(['本方姓名', '对方姓名']).agg({
+                platform_summary = platform_data.groupby(['本方姓名', '对方姓名'], observed=True).agg({
                     '收入总额': 'sum',
                     '支出总额': 'sum',
                     '交易次数': 'sum'
-                }).reset_index()
+                })
 
                 # 重命名列以区分不同平台
                 platform_summary = platform_summary.rename(columns={
@@ -1089,20 +1045,18 @@ class ExcelExporter(BaseExporter):
                 other_platforms_data[platform] = platform_summary
 
             # 计算其他平台汇总信息（用于"平台"字段）
-            other_bill_total_summary = other_bill_platforms_df.groupby(['本方姓名', '对方姓名']).agg({
+            other_bill_total_summary = other_bill_platforms_df.groupby(['本方姓名', '对方姓名'], observed=True).agg({
                 '平台': lambda x: '、'.join(x.unique())
             }).reset_index()
 
             # 计算平台金额分布详情
-            other_bill_platform_summary = other_bill_platforms_df.groupby(['本方姓名', '对方姓名', '平台']).agg({
+            other_bill_platform_summary = other_bill_platforms_df.groupby(['本方姓名', '对方姓名', '平台'], observed=True).agg({
                 '收入总额': 'sum',
                 '支出总额': 'sum',
                 '交易次数': 'sum'
             }).reset_index()
 
-            platform_details = other_bill_platform_summary.groupby(['本方姓名', '对方姓名']).apply(
-                lambda group: self._format_platform_details(group)
-            ).reset_index(name='其他账单平台金额分布')
+            platform_details = self._build_platform_details(other_bill_platform_summary, '其他账单平台金额分布')
 
             # 合并平台信息和平台详情
             other_platform_info = pd.merge(other_bill_total_summary, platform_details, on=['本方姓名', '对方姓名'])
@@ -1111,43 +1065,13 @@ class ExcelExporter(BaseExporter):
         # 处理话单数据
         call_summary = pd.DataFrame()
         if not call_df.empty:
-            # 获取话单中的对方详细信息
-            agg_dict = {
-                '通话次数': 'sum'
-            }
-
-            # 检查通话时长列名
-            if '通话总时长(分钟)' in call_df.columns:
-                agg_dict['通话总时长(分钟)'] = 'sum'
-            elif '通话时长' in call_df.columns:
-                agg_dict['通话时长'] = 'sum'
-
-            # 安全地添加可选字段
-            if '对方号码' in call_df.columns:
-                agg_dict['对方号码'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-            # 检查带lambda后缀的字段名（来自话单频率分析）
-            if '对方单位名称_<lambda>' in call_df.columns:
-                agg_dict['对方单位名称_<lambda>'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-            elif '对方单位名称' in call_df.columns:
-                agg_dict['对方单位名称'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-            if '对方职务_<lambda>' in call_df.columns:
-                agg_dict['对方职务_<lambda>'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-            elif '对方职务' in call_df.columns:
-                agg_dict['对方职务'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-
-            call_summary = call_df.groupby(['本方姓名', '对方姓名']).agg(agg_dict).reset_index()
+            call_summary = self._prepare_call_aggregates(call_df, include_source=False)
 
         # 开始合并数据
         merged_df = base_details.copy()
 
         # 与每个其他账单平台数据合并
-        for platform, platform_data in other_platforms_data.items():
-            merged_df = pd.merge(
-                merged_df,
-                platform_data,
-                on=['本方姓名', '对方姓名'],
-                how='left'
-            )
+        merged_df = self._attach_platform_columns(merged_df, other_platforms_data)
 
         # 合并平台金额分布详情
         if platform_details_list:
@@ -1168,39 +1092,40 @@ class ExcelExporter(BaseExporter):
                 how='left'
             )
 
-        # 填充空值
+        # 填充空值（各列的填充值汇总为一个字典，最后一次性填充）
         # 填充各平台的金额字段
-        for col in merged_df.columns:
-            if any(platform in col for platform in ['银行', '微信', '支付宝']) and any(field in col for field in ['收入总额', '支出总额', '交易次数']):
-                merged_df[col] = merged_df[col].fillna(0)
+        fill_values = dict.fromkeys(self._platform_numeric_columns(merged_df, [base_platform, *other_platforms_data]), 0)
 
         # 填充其他字段
         if '平台' in merged_df.columns:
-            merged_df['平台'] = merged_df['平台'].fillna('无')
+            fill_values['平台'] = '无'
         if '平台金额分布' in merged_df.columns:
-            merged_df['平台金额分布'] = merged_df['平台金额分布'].fillna('无')
+            fill_values['平台金额分布'] = '无'
         if '其他账单平台金额分布' in merged_df.columns:
-            merged_df['其他账单平台金额分布'] = merged_df['其他账单平台金额分布'].fillna('无')
+            fill_values['其他账单平台金额分布'] = '无'
         if '通话次数' in merged_df.columns:
-            merged_df['通话次数'] = merged_df['通话次数'].fillna(0)
+            fill_values['通话次数'] = 0
         if '通话总时长(分钟)' in merged_df.columns:
-            merged_df['通话总时长(分钟)'] = merged_df['通话总时长(分钟)'].fillna(0)
+            fill_values['通话总时长(分钟)'] = 0
         elif '通话时长' in merged_df.columns:
-            merged_df['通话时长'] = merged_df['通话时长'].fillna(0)
+            fill_values['通话时长'] = 0
         if '数据来源' in merged_df.columns:
-            merged_df['数据来源'] = merged_df['数据来源'].fillna('未知')
+            fill_values['数据来源'] = '未知'
 
         # 安全地填充可选字段的空值
         if '对方号码' in merged_df.columns:
-            merged_df['对方号码'] = merged_df['对方号码'].fillna('')
+            fill_values['对方号码'] = ''
         if '对方单位名称_<lambda>' in merged_df.columns:
-            merged_df['对方单位名称_<lambda>'] = merged_df['对方单位名称_<lambda>'].fillna('')
+            fill_values['对方单位名称_<lambda>'] = ''
         elif '对方单位名称' in merged_df.columns:
-            merged_df['对方单位名称'] = merged_df['对方单位名称'].fillna('')
+            fill_values['对方单位名称'] = ''
         if '对方职务_<lambda>' in merged_df.columns:
-            merged_df['对方职务_<lambda>'] = merged_df['对方职务_<lambda>'].fillna('')
+            fill_values['对方职务_<lambda>'] = ''
         elif '对方职务' in merged_df.columns:
-            merged_df['对方职务'] = merged_df['对方职务'].fillna('')
+            fill_values['对方职务'] = ''
+
+        # 一次性填充所有空值
+        merged_df.fillna(fill_values, inplace=True)
 
         # 重新排列列的顺序
         base_columns = ['本方姓名', '对方姓名']
@@ -1265,62 +1190,226 @@ class ExcelExporter(BaseExporter):
 
 
 
-    def _format_platform_details(self, group: pd.DataFrame) -> str:
-        """格式化平台金额分布详情"""
-        details = []
-        for _, row in group.iterrows():
-            platform = row['平台']
-            income = row['收入总额']
-            expense = row['支出总额']
-            if income > 0 or expense > 0:
-                detail = f"{platform}(收入{income:.0f}元,支出{expense:.0f}元)"
-                details.append(detail)
-        return '; '.join(details) if details else '无'
-
-    def _cross_analyze_with_bill_base(self, bill_df: pd.DataFrame, call_df: pd.DataFrame) -> pd.DataFrame:
-        """以账单类为基准进行交叉分析，支持跨数据源对手信息显示"""
-        # 以账单数据为基础，不创建额外组合
-
-        # 对账单类数据按对方姓名进行金额累计和去重，并计算平台分布
-        bill_platform_summary = bill_df.groupby(['本方姓名', '对方姓名', '平台']).agg({
-            '收入总额': 'sum',
-            '支出总额': 'sum',
-            '交易次数': 'sum'
-        }).reset_index()
-
-        # 计算总金额
-        bill_total_summary = bill_df.groupby(['本方姓名', '对方姓名']).agg({
-            '收入总额': 'sum',
-            '支出总额': 'sum',
-            '交易次数': 'sum',
-            '平台': lambda x: '、'.join(x.unique())
-        }).reset_index()
+    def _cached_aggregate(self, df: pd.DataFrame, kind: str, build: Callable[[], tuple]) -> tuple:
+        """
+        按数据框对象缓存预聚合结果，同一次综合分析中的多个交叉分析复用
+        
+        缓存键为(对象id, 行数, 列名, 类型)，条目同时保存数据框本身，以身份比较排除id被复用的情况。
+        返回的数据框由多个分析共享，调用方不应原地修改。
+        """
+        key = (id(df), len(df), tuple(df.columns), kind)
+        entry = self._aggregate_cache.get(key)
+        if entry is not None and entry[0] is df:
+            return entry[1]
+        
+        result = build()
+        if len(self._aggregate_cache) >= 8:
+            self._aggregate_cache.pop(next(iter(self._aggregate_cache)))
+        self._aggregate_cache[key] = (df, result)
+        return result
+    
+    def _prepare_bill_aggregates(self, bill_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        账单类数据的预聚合：总金额（含涉及平台）、平台金额分布详情及各平台独立字段
+        
+        Parameters:
+        -----------
+        bill_df : pd.DataFrame
+            账单类频率表数据
+            
+        Returns:
+        --------
+        Tuple[pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]
+            总金额汇总、平台金额分布详情、各平台独立汇总
+        """
+        def build():
+            bill_platform_summary, bill_total_summary, platform_individual_data = self._summarize_bill_platforms(bill_df)
+            platform_details = self._build_platform_details(bill_platform_summary, '平台金额分布')
+            return bill_total_summary, platform_details, platform_individual_data
+        
+        return self._cached_aggregate(bill_df, 'bill', build)
+    
+    def _prepare_call_aggregates(self, call_df: pd.DataFrame, include_source: bool) -> pd.DataFrame:
+        """
+        话单数据按(本方姓名, 对方姓名)的预聚合：通话次数、通话时长及对方详细信息
+        
+        Parameters:
+        -----------
+        call_df : pd.DataFrame
+            话单类频率表数据
+        include_source : bool
+            是否同时汇总数据来源字段
+            
+        Returns:
+        --------
+        pd.DataFrame
+            话单汇总
+        """
+        def build():
+            agg_dict = {
+                '通话次数': 'sum'
+            }
+            if include_source:
+                agg_dict['数据来源'] = 'first'
 
-        # 计算各平台的金额分布
-        platform_details = bill_platform_summary.groupby(['本方姓名', '对方姓名']).apply(
-            lambda group: self._format_platform_details(group)
-        ).reset_index(name='平台金额分布')
+            # 检查通话时长列名
+            if '通话总时长(分钟)' in call_df.columns:
+                agg_dict['通话总时长(分钟)'] = 'sum'
+            elif '通话时长' in call_df.columns:
+                agg_dict['通话时长'] = 'sum'
 
-        # 为每个平台创建独立字段
+            # 安全地添加可选字段（'first'取各组第一个非空值）
+            optional_fields = []
+            if '对方号码' in call_df.columns:
+                optional_fields.append('对方号码')
+            # 检查带lambda后缀的字段名（来自话单频率分析）
+            if '对方单位名称_<lambda>' in call_df.columns:
+                optional_fields.append('对方单位名称_<lambda>')
+            elif '对方单位名称' in call_df.columns:
+                optional_fields.append('对方单位名称')
+            if '对方职务_<lambda>' in call_df.columns:
+                optional_fields.append('对方职务_<lambda>')
+            elif '对方职务' in call_df.columns:
+                optional_fields.append('对方职务')
+            agg_dict.update(dict.fromkeys(optional_fields, 'first'))
+
+            call_details = call_df.groupby(['本方姓名', '对方姓名'], observed=True).agg(agg_dict).reset_index()
+            # 全为空的组填充为''：以账单类为基准的跨人员匹配依赖这些值，不能留空让其取到其他人员的信息
+            if optional_fields:
+                call_details[optional_fields] = call_details[optional_fields].fillna('')
+            return (call_details,)
+        
+        return self._cached_aggregate(call_df, f'call:{include_source}', build)[0]
+    
+    def _summarize_bill_platforms(self, bill_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
+        """
+        对账单类数据做一次(本方姓名, 对方姓名, 平台)分组，派生出各层级的汇总
+        
+        Parameters:
+        -----------
+        bill_df : pd.DataFrame
+            账单类频率表数据
+            
+        Returns:
+        --------
+        Tuple[pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]
+            按平台汇总的数据、按(本方姓名, 对方姓名)汇总的总金额（含涉及的平台）、
+            各平台以"平台_字段"命名的独立汇总（以本方姓名、对方姓名为索引）
+        """
+        keys = ['本方姓名', '对方姓名']
+        amount_columns = ['收入总额', '支出总额', '交易次数']
+        
+        # 不排序分组，保留各组合内平台首次出现的顺序，用于拼接"平台"字段
+        grouped = bill_df.groupby(keys + ['平台'], sort=False, observed=True)[amount_columns].sum()
+        
+        platforms = grouped.index.get_level_values('平台')
+        pair_levels = [grouped.index.get_level_values(0), grouped.index.get_level_values(1)]
+        bill_total_summary = grouped.groupby(level=[0, 1], observed=True).sum()
+        bill_total_summary['平台'] = pd.Series(platforms, index=grouped.index).groupby(pair_levels, observed=True).agg('、'.join)
+        bill_total_summary = bill_total_summary.reset_index()
+        
+        bill_platform_summary = grouped.sort_index().reset_index()
+        
+        # 由同一分组结果展开各平台的独立字段
         platform_individual_data = {}
-        if not bill_platform_summary.empty:
-            platforms = bill_platform_summary['平台'].unique()
-            for platform in platforms:
-                platform_data = bill_platform_summary[bill_platform_summary['平台'] == platform]
-                platform_summary = platform_data.groupby(['本方姓名', '对方姓名']).agg({
-                    '收入总额': 'sum',
-                    '支出总额': 'sum',
-                    '交易次数': 'sum'
-                }).reset_index()
+        if not grouped.empty:
+            wide = grouped.unstack('平台')
+            for platform in bill_platform_summary['平台'].unique():
+                platform_summary = wide.xs(platform, axis=1, level='平台').dropna(how='all')
+                platform_summary.columns = [f'{platform}_{field}' for field in platform_summary.columns]
+                platform_individual_data[platform] = platform_summary
+        
+        return bill_platform_summary, bill_total_summary, platform_individual_data
+    
+    def _attach_platform_columns(self, merged_df: pd.DataFrame, platform_frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        按(本方姓名, 对方姓名)把各平台的独立字段一次性拼接到合并结果上
+        
+        各平台数据已以两列姓名为索引，只需一次按索引对齐的concat，代替逐个平台的左合并。
+        
+        Parameters:
+        -----------
+        merged_df : pd.DataFrame
+            合并结果，每个(本方姓名, 对方姓名)组合只有一行
+        platform_frames : Dict[str, pd.DataFrame]
+            平台名到该平台独立汇总的映射
+            
+        Returns:
+        --------
+        pd.DataFrame
+            拼接了各平台字段的合并结果，行与原合并结果一致
+        """
+        if not platform_frames:
+            return merged_df
+        
+        base = merged_df.set_index(['本方姓名', '对方姓名'])
+        combined = pd.concat([base, *platform_frames.values()], axis=1)
+        # concat按索引做外连接，再按原有组合取行，等价于左合并
+        return combined.reindex(base.index).reset_index()
+    
+    def _platform_numeric_columns(self, df: pd.DataFrame, platforms) -> List[str]:
+        """
+        返回数据框中已存在的各平台金额字段列名（{平台}_{收入总额/支出总额/交易次数}）
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            合并后的数据框
+        platforms : Iterable[str]
+            平台名称
+            
+        Returns:
+        --------
+        List[str]
+            按平台、字段顺序排列的列名
+        """
+        columns = set(df.columns)
+        return [
+            f'{platform}_{field}'
+            for platform in platforms
+            for field in ('收入总额', '支出总额', '交易次数')
+            if f'{platform}_{field}' in columns
+        ]
+    
+    def _build_platform_details(self, platform_summary: pd.DataFrame, column_name: str) -> pd.DataFrame:
+        """
+        生成各(本方姓名, 对方姓名)组合的平台金额分布详情
+        
+        Parameters:
+        -----------
+        platform_summary : pd.DataFrame
+            按本方姓名、对方姓名、平台汇总的收入总额/支出总额
+        column_name : str
+            详情列的列名
+            
+        Returns:
+        --------
+        pd.DataFrame
+            本方姓名、对方姓名及详情列，没有收支的组合为'无'
+        """
+        keys = ['本方姓名', '对方姓名']
+        
+        # 整列拼接各平台的描述文本，只保留有收入或支出的平台
+        active = platform_summary[(platform_summary['收入总额'] > 0) | (platform_summary['支出总额'] > 0)]
+        detail = (
+            active['平台'].astype(str)
+            + '(收入' + active['收入总额'].round().astype('int64').astype(str)
+            + '元,支出' + active['支出总额'].round().astype('int64').astype(str) + '元)'
+        )
+        joined = detail.groupby([active['本方姓名'], active['对方姓名']], sort=False, observed=True).agg('; '.join)
+        
+        result = platform_summary[keys].drop_duplicates().merge(
+            joined.rename(column_name).reset_index(), on=keys, how='left'
+        )
+        result[column_name] = result[column_name].fillna('无')
+        return result
 
-                # 重命名列以区分不同平台
-                platform_summary = platform_summary.rename(columns={
-                    '收入总额': f'{platform}_收入总额',
-                    '支出总额': f'{platform}_支出总额',
-                    '交易次数': f'{platform}_交易次数'
-                })
+    def _cross_analyze_with_bill_base(self, bill_df: pd.DataFrame, call_df: pd.DataFrame) -> pd.DataFrame:
+        """以账单类为基准进行交叉分析，支持跨数据源对手信息显示"""
+        # 以账单数据为基础，不创建额外组合
 
-                platform_individual_data[platform] = platform_summary
+        # 对账单类数据按对方姓名进行金额累计和去重，计算总金额及各平台分布（与以话单为基准的分析共用）
+        bill_total_summary, platform_details, platform_individual_data = self._prepare_bill_aggregates(bill_df)
 
         # 合并总金额和平台详情
         if not bill_total_summary.empty and not platform_details.empty:
@@ -1328,31 +1417,8 @@ class ExcelExporter(BaseExporter):
         else:
             bill_summary_with_details = bill_total_summary.copy() if not bill_total_summary.empty else pd.DataFrame()
 
-        # 获取话单中的对方详细信息
-        agg_dict = {
-            '通话次数': 'sum'
-        }
-
-        # 检查通话时长列名
-        if '通话总时长(分钟)' in call_df.columns:
-            agg_dict['通话总时长(分钟)'] = 'sum'
-        elif '通话时长' in call_df.columns:
-            agg_dict['通话时长'] = 'sum'
-
-        # 安全地添加可选字段
-        if '对方号码' in call_df.columns:
-            agg_dict['对方号码'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        # 检查带lambda后缀的字段名（来自话单频率分析）
-        if '对方单位名称_<lambda>' in call_df.columns:
-            agg_dict['对方单位名称_<lambda>'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        elif '对方单位名称' in call_df.columns:
-            agg_dict['对方单位名称'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        if '对方职务_<lambda>' in call_df.columns:
-            agg_dict['对方职务_<lambda>'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-        elif '对方职务' in call_df.columns:
-            agg_dict['对方职务'] = lambda x: x.dropna().iloc[0] if len(x.dropna()) > 0 else ''
-
-        call_details = call_df.groupby(['本方姓名', '对方姓名']).agg(agg_dict).reset_index()
+        # 获取话单中的对方详细信息（与以各平台为基准的分析共用）
+        call_details = self._prepare_call_aggregates(call_df, include_source=False)
 
         # 以账单数据为基础进行合并
         if not bill_summary_with_details.empty:
@@ -1381,83 +1447,68 @@ class ExcelExporter(BaseExporter):
             elif '通话时长' in call_details.columns:
                 call_agg_dict['通话时长'] = 'sum'
 
-            call_contact_summary = call_details.groupby('对方姓名').agg(call_agg_dict).reset_index()
+            call_contact_summary = call_details.groupby('对方姓名', observed=True).agg(call_agg_dict).reset_index()
 
             # 添加单位信息字段
             if '对方单位名称_<lambda>' in call_details.columns:
                 call_contact_summary = pd.merge(
                     call_contact_summary,
-                    call_details.groupby('对方姓名')['对方单位名称_<lambda>'].first().reset_index(),
+                    call_details.groupby('对方姓名', observed=True)['对方单位名称_<lambda>'].first().reset_index(),
                     on='对方姓名'
                 )
             elif '对方单位名称' in call_details.columns:
                 call_contact_summary = pd.merge(
                     call_contact_summary,
-                    call_details.groupby('对方姓名')['对方单位名称'].first().reset_index(),
+                    call_details.groupby('对方姓名', observed=True)['对方单位名称'].first().reset_index(),
                     on='对方姓名'
                 )
 
             # 找出没有话单数据的账单记录
             no_call_mask = merged_df['通话次数'].isna()
             if no_call_mask.any():
-                # 基于对方姓名进行跨人员匹配
+                # 基于对方姓名进行跨人员匹配：汇总按对方姓名唯一，左合并后与merged_df逐行对齐
                 cross_match = pd.merge(
-                    merged_df[no_call_mask][['本方姓名', '对方姓名']],
+                    merged_df[['对方姓名']],
                     call_contact_summary,
                     on='对方姓名',
                     how='left'
                 )
 
-                # 更新没有匹配到的记录
-                for idx, row in cross_match.iterrows():
-                    if pd.notna(row['通话次数']):
-                        mask = (merged_df['本方姓名'] == row['本方姓名']) & (merged_df['对方姓名'] == row['对方姓名'])
-                        merged_df.loc[mask, '通话次数'] = row['通话次数']
-
-                        # 更新通话时长（检查列名）
-                        if '通话总时长(分钟)' in row and pd.notna(row['通话总时长(分钟)']):
-                            merged_df.loc[mask, '通话总时长(分钟)'] = row['通话总时长(分钟)']
-                        elif '通话时长' in row and pd.notna(row['通话时长']):
-                            merged_df.loc[mask, '通话时长'] = row['通话时长']
-
-                        # 更新单位信息
-                        if '对方单位名称_<lambda>' in row and pd.notna(row['对方单位名称_<lambda>']):
-                            merged_df.loc[mask, '对方单位名称_<lambda>'] = row['对方单位名称_<lambda>']
-                        elif '对方单位名称' in row and pd.notna(row['对方单位名称']):
-                            merged_df.loc[mask, '对方单位名称'] = row['对方单位名称']
+                # 只更新没有话单数据、且按对方姓名匹配到话单的记录；各字段仅在匹配值非空时覆盖
+                matched = no_call_mask.to_numpy() & cross_match['通话次数'].notna().to_numpy()
+                for col in call_contact_summary.columns.drop('对方姓名'):
+                    values = cross_match[col].to_numpy()
+                    update = matched & pd.notna(values)
+                    if update.any():
+                        merged_df[col] = merged_df[col].where(~update, values)
 
         # 与各平台独立数据合并
-        for platform, platform_data in platform_individual_data.items():
-            merged_df = pd.merge(
-                merged_df,
-                platform_data,
-                on=['本方姓名', '对方姓名'],
-                how='left'
-            )
+        merged_df = self._attach_platform_columns(merged_df, platform_individual_data)
 
-        # 填充空值
-        merged_df['通话次数'] = merged_df['通话次数'].fillna(0)
+        # 填充空值（各列的填充值汇总为一个字典，最后一次性填充）
+        fill_values = {'通话次数': 0}
         if '通话总时长(分钟)' in merged_df.columns:
-            merged_df['通话总时长(分钟)'] = merged_df['通话总时长(分钟)'].fillna(0)
+            fill_values['通话总时长(分钟)'] = 0
         elif '通话时长' in merged_df.columns:
-            merged_df['通话时长'] = merged_df['通话时长'].fillna(0)
+            fill_values['通话时长'] = 0
 
         # 填充各平台的金额字段
-        for col in merged_df.columns:
-            if any(platform in col for platform in ['银行', '微信', '支付宝']) and any(field in col for field in ['收入总额', '支出总额', '交易次数']):
-                merged_df[col] = merged_df[col].fillna(0)
+        fill_values.update(dict.fromkeys(self._platform_numeric_columns(merged_df, platform_individual_data), 0))
 
         # 安全地填充可选字段的空值
         if '对方号码' in merged_df.columns:
-            merged_df['对方号码'] = merged_df['对方号码'].fillna('')
+            fill_values['对方号码'] = ''
         if '对方单位名称_<lambda>' in merged_df.columns:
-            merged_df['对方单位名称_<lambda>'] = merged_df['对方单位名称_<lambda>'].fillna('')
+            fill_values['对方单位名称_<lambda>'] = ''
         elif '对方单位名称' in merged_df.columns:
-            merged_df['对方单位名称'] = merged_df['对方单位名称'].fillna('')
+            fill_values['对方单位名称'] = ''
         if '对方职务_<lambda>' in merged_df.columns:
-            merged_df['对方职务_<lambda>'] = merged_df['对方职务_<lambda>'].fillna('')
+            fill_values['对方职务_<lambda>'] = ''
         elif '对方职务' in merged_df.columns:
-            merged_df['对方职务'] = merged_df['对方职务'].fillna('')
+            fill_values['对方职务'] = ''
+
+        # 一次性填充所有空值
+        merged_df.fillna(fill_values, inplace=True)
 
         # 重新排列列的顺序，将对方详细信息放在对方姓名后面
         base_columns = ['本方姓名', '对方姓名']
@@ -7,12 +7,180 @@
 """
 
 import os
+import sys
+import json
+import shutil
 import pickle
+import struct
 import hashlib
 import time
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 import logging
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from src.datasource.bank_model import BankDataModel
+from src.datasource.call_model import CallDataModel
+from src.datasource.payment.alipay_model import AlipayDataModel
+from src.datasource.payment.wechat_model import WeChatDataModel
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# 代码变更检测只需非加密哈希，优先使用更快的blake3/xxhash
+try:
+    from blake3 import blake3 as _code_hasher
+except ImportError:
+    try:
+        from xxhash import xxh3_128 as _code_hasher
+    except ImportError:
+        _code_hasher = hashlib.md5
+
+
+# 缓存键与数据模型类的对应关系
+_MODEL_CLASSES = {
+    'bank': BankDataModel,
+    'call': CallDataModel,
+    'alipay': AlipayDataModel,
+    'wechat': WeChatDataModel
+}
+
+# 缓存文件格式：魔数 + 主pickle流 + 协议5带外缓冲区（长度前缀，缓冲区起始位置按 _BUFFER_ALIGNMENT 字节对齐）
+_CACHE_MAGIC = b'DDCACHE6'
+_UNALIGNED_CACHE_MAGIC = b'DDCACHE5'
+_BUFFER_ALIGNMENT = 64
+_LEN_STRUCT = struct.Struct('<Q')
+_IO_BUFFER_SIZE = 1 << 20
+
+# 旧版本Python上哈希源文件时的分块大小
+_HASH_CHUNK_SIZE = 1 << 18
+
+# 单文件哈希方式标识，哈希算法或内容范围变化时使备忘录失效
+_HASH_SCHEME = f"full-content:{getattr(_code_hasher, '__name__', 'md5')}"
+
+# 列式缓存：每个版本一个目录，DataFrame存为Feather文件（无法转换时存为pickle），其余信息存入JSON元数据文件
+_META_FILE_NAME = 'meta.json'
+_FEATHER_SUFFIX = '.feather'
+_PICKLE_SUFFIX = '.pkl'
+
+# 单文件哈希计算失败的标记
+_HASH_FAILED = object()
+
+# 需要随缓存保存的模型列名配置属性（驻留字符串，使各模型共享同一对象）
+_COLUMN_ATTRS = tuple(sys.intern(attr) for attr in (
+    'name_column', 'date_column', 'amount_column', 'balance_column',
+    'type_column', 'summary_column', 'remark_column', 'direction_column',
+    'opposite_name_column', 'phone_column', 'duration_column',
+    'call_type_column', 'opposite_phone_column', 'opposite_location_column',
+    'time_column', 'credit_flag', 'debit_flag'
+))
+
+# 缓存有效性检查结果的复用时长（秒），用于合并同一次操作中的重复检查
+_VALIDITY_TTL = 1.0
+
+# 参与代码哈希计算的核心分析逻辑文件
+_KEY_FILES = (
+    "src/analysis/bank_analyzer.py",
+    "src/analysis/call_analyzer.py",
+    "src/analysis/payment/wechat_analyzer.py",
+    "src/analysis/payment/alipay_analyzer.py",
+    "src/analysis/comprehensive_analyzer.py",
+    "src/datasource/bank_model.py",
+    "src/datasource/call_model.py",
+    "src/datasource/payment/wechat_model.py",
+    "src/datasource/payment/alipay_model.py"
+)
+
+
+@contextmanager
+def _atomic_open(path: str, mode: str = 'wb', **kwargs):
+    """
+    原子写入文件：先写入临时文件并落盘，再通过os.replace替换目标文件，避免写入中断留下损坏的文件
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _serialize_cache(obj: Any) -> List[Any]:
+    """
+    以最高协议在内存中序列化缓存对象，返回按顺序写入文件的数据块
+
+    DataFrame底层数组作为带外缓冲区直接引用，避免在pickle流中复制；
+    序列化完成之后才创建文件，序列化失败不会留下空文件
+    """
+    buffers = []
+    main = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL, fix_imports=False,
+                        buffer_callback=buffers.append)
+    header = bytearray(_CACHE_MAGIC)
+    header += _LEN_STRUCT.pack(len(main))
+    chunks = [header, main, _LEN_STRUCT.pack(len(buffers))]
+    offset = len(header) + len(main) + _LEN_STRUCT.size
+    for buffer in buffers:
+        raw = buffer.raw()
+        offset += _LEN_STRUCT.size
+        padding = -offset % _BUFFER_ALIGNMENT
+        chunks.append(_LEN_STRUCT.pack(raw.nbytes) + bytes(padding))
+        chunks.append(raw)
+        offset += padding + raw.nbytes
+    return chunks
+
+
+def _dump_cache(obj: Any, file_path: str) -> None:
+    """序列化缓存对象并原子写入文件"""
+    chunks = _serialize_cache(obj)
+    with _atomic_open(file_path, 'wb', buffering=_IO_BUFFER_SIZE) as f:
+        f.writelines(chunks)
+
+
+def _load_cache(file_path: str) -> Any:
+    """
+    一次读入缓存文件，兼容旧版纯pickle格式的缓存文件
+
+    整个文件读入一块可写内存后立即关闭文件，带外缓冲区直接引用这块内存而无需复制；
+    写入时缓冲区已按 _BUFFER_ALIGNMENT 对齐，重建的数组保持对齐且可写
+    """
+    with open(file_path, 'rb') as f:
+        data = bytearray(os.fstat(f.fileno()).st_size)
+        f.readinto(data)
+    view = memoryview(data)
+
+    magic_len = len(_CACHE_MAGIC)
+    magic = view[:magic_len]
+    if magic == _CACHE_MAGIC:
+        alignment = _BUFFER_ALIGNMENT
+    elif magic == _UNALIGNED_CACHE_MAGIC:
+        alignment = 1
+    else:
+        return pickle.loads(view)
+
+    offset = magic_len
+    main_len, = _LEN_STRUCT.unpack_from(view, offset)
+    offset += _LEN_STRUCT.size
+    main = view[offset:offset + main_len]
+    offset += main_len
+    buffer_count, = _LEN_STRUCT.unpack_from(view, offset)
+    offset += _LEN_STRUCT.size
+    buffers = []
+    for _ in range(buffer_count):
+        size, = _LEN_STRUCT.unpack_from(view, offset)
+        offset += _LEN_STRUCT.size
+        offset += -offset % alignment
+        buffers.append(view[offset:offset + size])
+        offset += size
+    return pickle.loads(main, fix_imports=False, buffers=buffers)
 
 
 class DataCacheManager:
@@ -51,68 +219,132 @@ class DataCacheManager:
         # 缓存文件路径（版本化缓存）
         self.code_hash_file = os.path.join(cache_dir, "code_hash.txt")
         
+        # 单文件哈希备忘录：{文件路径: [mtime, size, 哈希值]}，文件未变化时免去重新读取和哈希
+        self.hash_memo_file = os.path.join(cache_dir, "code_hash.meta.json")
+        self._hash_memo = self._load_hash_memo()
+        
         # 版本化缓存：使用时间戳作为版本标识
         self.data_cache_file = os.path.join(cache_dir, "data_models.pkl")  # 默认文件名，用于向后兼容
         
+        # 缓存有效性检查结果：{缓存文件路径: (检查时间, 是否有效)}
+        self._validity_cache: Dict[str, tuple] = {}
+        
         self.logger.info(f"数据缓存管理器初始化完成，缓存目录: {self.cache_dir}，缓存启用: {self.cache_enabled}")
     
+    def _load_hash_memo(self) -> Dict[str, list]:
+        """加载磁盘上的单文件哈希备忘录，哈希方式不同时丢弃旧记录"""
+        try:
+            with open(self.hash_memo_file, 'r', encoding='utf-8') as f:
+                memo = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(memo, dict) or memo.get('scheme') != _HASH_SCHEME:
+            return {}
+        return memo.get('files', {})
+    
+    def _save_hash_memo(self):
+        """保存单文件哈希备忘录"""
+        try:
+            with _atomic_open(self.hash_memo_file, 'w', encoding='utf-8') as f:
+                json.dump({'scheme': _HASH_SCHEME, 'files': self._hash_memo}, f)
+        except OSError as e:
+            self.logger.warning(f"保存代码哈希备忘录失败: {e}")
+    
+    def _hash_file(self, file_path: str) -> str:
+        """
+        计算单个源文件内容的哈希值
+        
+        直接对完整文件内容做分块哈希，不再逐行筛选，读取循环由C实现
+        
+        Parameters:
+        -----------
+        file_path : str
+            源文件路径
+            
+        Returns:
+        --------
+        str
+            文件哈希值
+        """
+        with open(file_path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, _code_hasher).hexdigest()
+            
+            hash_obj = _code_hasher()
+            while chunk := f.read(_HASH_CHUNK_SIZE):
+                hash_obj.update(chunk)
+            return hash_obj.hexdigest()
+    
+    def _try_hash_file(self, file_path: str):
+        """计算单个文件哈希，失败时记录警告并返回 _HASH_FAILED"""
+        try:
+            return self._hash_file(file_path)
+        except Exception as e:
+            self.logger.warning(f"计算文件 {file_path} 哈希失败: {e}")
+            return _HASH_FAILED
+    
     def _calculate_code_hash(self) -> str:
         """
         计算源代码的哈希值，用于检测代码变更
         
+        单文件哈希按 (mtime, size) 备忘，只有文件发生变化时才重新读取
+        
         Returns:
         --------
         str
             源代码哈希值
         """
-        # 使用更稳定的哈希策略：基于关键文件的内容
-        # 只检查核心分析逻辑文件，避免因注释或格式变化导致缓存失效
-        
-        key_files = [
-            "src/analysis/bank_analyzer.py",
-            "src/analysis/call_analyzer.py", 
-            "src/analysis/payment/wechat_analyzer.py",
-            "src/analysis/payment/alipay_analyzer.py",
-            "src/analysis/comprehensive_analyzer.py",
-            "src/datasource/bank_model.py",
-            "src/datasource/call_model.py",
-            "src/datasource/payment/wechat_model.py",
-            "src/datasource/payment/alipay_model.py"
-        ]
-        
-        hash_obj = hashlib.md5()
-        
-        for file_path in key_files:
-            if not os.path.exists(file_path):
-                continue
-                
+        # 只检查核心分析逻辑文件的内容
+        file_stats = {}
+        stale_files = []
+        for file_path in _KEY_FILES:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 只提取函数定义和类定义的关键内容，忽略注释和空行
-                lines = []
-                for line in content.split('\n'):
-                    stripped = line.strip()
-                    if stripped and not stripped.startswith('#') and not stripped.startswith('"""'):
-                        # 只保留包含def或class的行及其后续行（直到空行）
-                        if 'def ' in stripped or 'class ' in stripped:
-                            lines.append(stripped)
-                
-                if lines:
-                    key_content = '\n'.join(lines)
-                    hash_obj.update(key_content.encode())
-                    
-            except Exception as e:
-                self.logger.warning(f"计算文件 {file_path} 哈希失败: {e}")
+                st = os.stat(file_path)
+            except OSError:
                 continue
+            file_stats[file_path] = st
+            
+            memo = self._hash_memo.get(file_path)
+            if memo is None or memo[0] != st.st_mtime or memo[1] != st.st_size:
+                stale_files.append(file_path)
+        
+        # 并行重新计算发生变化的文件，重叠磁盘I/O
+        if stale_files:
+            with ThreadPoolExecutor(max_workers=min(4, len(stale_files))) as executor:
+                results = list(executor.map(self._try_hash_file, stale_files))
+            for file_path, file_hash in zip(stale_files, results):
+                if file_hash is _HASH_FAILED:
+                    del file_stats[file_path]
+                    continue
+                st = file_stats[file_path]
+                self._hash_memo[file_path] = [st.st_mtime, st.st_size, file_hash]
+        
+        # 按固定文件顺序合并各文件哈希，保证结果与计算顺序无关
+        hash_obj = _code_hasher()
+        has_content = False
+        for file_path in file_stats:
+            file_hash = self._hash_memo[file_path][2]
+            if file_hash:
+                hash_obj.update(file_hash.encode())
+                has_content = True
         
         # 如果关键文件都为空，使用固定哈希值
-        if hash_obj.digest_size == 0:
+        if not has_content:
             hash_obj.update(b"default_cache_key")
         
         return hash_obj.hexdigest()
     
+    @staticmethod
+    def _max_key_file_mtime() -> float:
+        """获取关键源文件的最新修改时间"""
+        max_mtime = 0.0
+        for file_path in _KEY_FILES:
+            try:
+                max_mtime = max(max_mtime, os.path.getmtime(file_path))
+            except OSError:
+                continue
+        return max_mtime
+    
     def is_cache_valid(self, cache_file_path: str = None) -> bool:
         """
         检查缓存是否有效
@@ -120,7 +352,7 @@ class DataCacheManager:
         Parameters:
         -----------
         cache_file_path : str, optional
-            指定要检查的缓存文件路径，如果为None则检查默认缓存文件
+            指定要检查的缓存文件路径，如果为None则检查最新的缓存版本
             
         Returns:
         --------
@@ -132,27 +364,59 @@ class DataCacheManager:
             self.logger.debug("缓存功能已禁用")
             return False
             
-        # 确定要检查的缓存文件路径
+        # 确定要检查的缓存文件路径：默认检查最新的缓存版本
         if cache_file_path is None:
-            cache_file_path = self.data_cache_file
+            available_versions = self.get_available_cache_versions()
+            cache_file_path = available_versions[-1]['file_path'] if available_versions else self.data_cache_file
+            
+        # 短时间内重复检查同一缓存文件时直接复用结果
+        cached = self._validity_cache.get(cache_file_path)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < _VALIDITY_TTL:
+            return cached[1]
+        
+        is_valid = self._check_cache_valid(cache_file_path)
+        self._validity_cache[cache_file_path] = (now, is_valid)
+        return is_valid
+    
+    def _check_cache_valid(self, cache_file_path: str) -> bool:
+        """
+        检查指定缓存文件是否有效（不使用检查结果缓存）
+        
+        Parameters:
+        -----------
+        cache_file_path : str
+            要检查的缓存文件路径
             
+        Returns:
+        --------
+        bool
+            缓存是否有效
+        """
         # 检查缓存文件是否存在
         if not os.path.exists(cache_file_path):
             self.logger.debug(f"缓存文件不存在: {cache_file_path}")
             return False
             
-        # 检查缓存文件大小是否合理（避免损坏的缓存文件）
-        cache_size = os.path.getsize(cache_file_path)
-        if cache_size < 100:  # 小于100字节的缓存文件可能损坏
-            self.logger.debug("缓存文件大小异常")
-            return False
+        # 列式缓存目录以其元数据文件为准
+        if os.path.isdir(cache_file_path):
+            cache_file_path = os.path.join(cache_file_path, _META_FILE_NAME)
+            if not os.path.exists(cache_file_path):
+                self.logger.debug(f"缓存元数据文件不存在: {cache_file_path}")
+                return False
             
         # 检查缓存文件是否过期（默认7天，大大延长过期时间）
         cache_timeout = self.config.get('app.cache_timeout', 604800) if self.config else 604800
-        if time.time() - os.path.getmtime(cache_file_path) > cache_timeout:
+        cache_mtime = os.path.getmtime(cache_file_path)
+        if time.time() - cache_mtime > cache_timeout:
             self.logger.debug("缓存文件已过期")
             return False
             
+        # 关键源文件均未在缓存写入之后修改时，无需计算代码哈希
+        if self._max_key_file_mtime() <= cache_mtime:
+            self.logger.debug("缓存有效")
+            return True
+            
         # 简化代码变更检查：只有当关键分析逻辑发生重大变更时才失效
         # 这样可以实现跨会话的缓存复用
         if not os.path.exists(self.code_hash_file):
@@ -188,17 +452,21 @@ class DataCacheManager:
         bool
             清除是否成功
         """
+        self._validity_cache.clear()
+        
         try:
-            # 清除所有版本化的缓存文件
-            cache_files = [f for f in os.listdir(self.cache_dir) 
-                          if f.startswith("data_models") and f.endswith(".pkl")]
-            
+            # 清除所有版本化的缓存文件及列式缓存目录
             cleared_count = 0
-            for cache_file in cache_files:
-                file_path = os.path.join(self.cache_dir, cache_file)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    cleared_count += 1
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("data_models"):
+                        continue
+                    if entry.is_dir():
+                        shutil.rmtree(entry.path)
+                        cleared_count += 1
+                    elif entry.name.endswith(".pkl"):
+                        os.remove(entry.path)
+                        cleared_count += 1
             
             # 清除代码哈希文件
             if os.path.exists(self.code_hash_file):
@@ -215,6 +483,8 @@ class DataCacheManager:
         """
         保存数据模型到缓存（改进版本，只保存可序列化的数据）
         
+        保存过程中直接读取各模型的data而不复制，调用方不应在保存期间修改数据
+        
         Parameters:
         -----------
         data_models : Dict[str, Any]
@@ -232,15 +502,46 @@ class DataCacheManager:
             self.logger.debug("缓存功能已禁用，跳过保存")
             return False
             
+        # 生成版本标识
+        if version is None:
+            version = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        self._validity_cache.clear()
+        if not self._write_data_models(data_models, version):
+            return False
+        
+        keep = self.config.get('app.cache_keep_versions', 5) if self.config else 5
+        self._evict_old_versions(keep, protect=version)
+        return True
+    
+    def _write_data_models(self, data_models: Dict[str, Any], version: str) -> bool:
+        """
+        将数据模型写入指定的缓存版本
+        
+        Parameters:
+        -----------
+        data_models : Dict[str, Any]
+            数据模型字典
+        version : str
+            缓存版本标识
+            
+        Returns:
+        --------
+        bool
+            写入是否成功
+        """
         try:
             # 计算当前代码哈希
             current_hash = self._calculate_code_hash()
             
-            # 生成版本标识
-            if version is None:
-                version = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # 创建可序列化的数据副本，避免保存包含线程锁的对象
+            if feather is not None:
+                self._save_columnar_version(data_models, version)
+                self._write_code_hash(current_hash)
+                self.logger.info(f"数据模型已保存到列式缓存版本 {version}，代码哈希: {current_hash[:8]}...")
+                return True
+
+            # 只提取可序列化的部分，避免保存包含线程锁的对象
+            # pickle只读取数据而不修改，因此直接引用model.data，无需复制（保存期间视输入为只读快照）
             serializable_data = {}
             for key, model in data_models.items():
                 if model is None:
@@ -248,7 +549,7 @@ class DataCacheManager:
                     
                 # 只保存必要的数据，避免序列化复杂对象
                 model_data = {
-                    'data': model.data.copy() if hasattr(model, 'data') and model.data is not None else None,
+                    'data': getattr(model, 'data', None),
                     'file_path': getattr(model, 'file_path', None),
                     'config_info': self._get_serializable_config(model)
                 }
@@ -256,28 +557,137 @@ class DataCacheManager:
             
             # 保存到版本化文件
             versioned_cache_file = os.path.join(self.cache_dir, f"data_models_{version}.pkl")
-            with open(versioned_cache_file, 'wb') as f:
-                pickle.dump(serializable_data, f)
+            _dump_cache(serializable_data, versioned_cache_file)
                 
             # 保存代码哈希
-            with open(self.code_hash_file, 'w', encoding='utf-8') as f:
-                f.write(current_hash)
+            self._write_code_hash(current_hash)
                 
             self.logger.info(f"数据模型已保存到缓存版本 {version}，代码哈希: {current_hash[:8]}...")
             return True
             
         except Exception as e:
             self.logger.error(f"保存数据模型到缓存失败: {e}")
-            # 如果保存失败，删除可能创建的0字节文件
-            if version is not None:
-                versioned_cache_file = os.path.join(self.cache_dir, f"data_models_{version}.pkl")
-                if os.path.exists(versioned_cache_file) and os.path.getsize(versioned_cache_file) == 0:
-                    try:
-                        os.remove(versioned_cache_file)
-                    except:
-                        pass
             return False
     
+    def _evict_old_versions(self, keep: Any, protect: Optional[str] = None):
+        """
+        只保留最新的若干个缓存版本，删除更早的版本
+        
+        Parameters:
+        -----------
+        keep : int
+            保留的版本数，小于1时按1处理
+        protect : str, optional
+            不得删除的版本（通常为刚写入的版本）
+        """
+        try:
+            keep = max(int(keep), 1)
+        except (TypeError, ValueError):
+            self.logger.warning(f"缓存保留版本数配置无效: {keep!r}，跳过清理旧版本")
+            return
+        
+        versions = self.get_available_cache_versions()
+        excess = len(versions) - keep
+        if excess <= 0:
+            return
+        candidates = [v for v in versions if v['version'] != protect]
+        for version_info in candidates[:excess]:
+            file_path = version_info['file_path']
+            try:
+                if os.path.isdir(file_path):
+                    shutil.rmtree(file_path)
+                else:
+                    os.remove(file_path)
+                self.logger.debug(f"已删除旧缓存版本 {version_info['version']}")
+            except OSError as e:
+                self.logger.warning(f"删除旧缓存版本 {version_info['version']} 失败: {e}")
+    
+    def _write_code_hash(self, code_hash: str):
+        """保存代码哈希及单文件哈希备忘录"""
+        with _atomic_open(self.code_hash_file, 'w', encoding='utf-8') as f:
+            f.write(code_hash)
+        self._save_hash_memo()
+
+    def _save_columnar_version(self, data_models: Dict[str, Any], version: str):
+        """
+        以列式格式保存一个缓存版本：DataFrame直接写为Feather文件，元数据以JSON保存
+
+        Parameters:
+        -----------
+        data_models : Dict[str, Any]
+            数据模型字典
+        version : str
+            缓存版本标识
+        """
+        version_dir = os.path.join(self.cache_dir, f"data_models_{version}")
+        os.makedirs(version_dir, exist_ok=True)
+
+        meta = {}
+        try:
+            for key, model in data_models.items():
+                if model is None:
+                    continue
+
+                data = getattr(model, 'data', None)
+                model_meta = {
+                    'data_file': None,
+                    'file_path': getattr(model, 'file_path', None),
+                    'config_info': self._get_serializable_config(model)
+                }
+                if data is not None:
+                    data_file = f"{key}{_FEATHER_SUFFIX}"
+                    try:
+                        with _atomic_open(os.path.join(version_dir, data_file), 'wb') as f:
+                            feather.write_feather(data, f, compression='lz4')
+                    except Exception as e:
+                        # 混合类型列等无法转换为Arrow的数据，退回pickle保存
+                        self.logger.debug(f"{key} 数据无法写为Feather格式，改用pickle: {e}")
+                        data_file = f"{key}{_PICKLE_SUFFIX}"
+                        _dump_cache(data, os.path.join(version_dir, data_file))
+                    model_meta['data_file'] = data_file
+                meta[key] = model_meta
+
+            # 元数据文件最后写入，作为该版本完整可用的标志
+            with _atomic_open(os.path.join(version_dir, _META_FILE_NAME), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, default=str)
+        except Exception:
+            shutil.rmtree(version_dir, ignore_errors=True)
+            raise
+
+    def _load_columnar_version(self, version_dir: str) -> Dict[str, Any]:
+        """
+        读取列式缓存版本，返回与单文件缓存相同结构的序列化数据
+
+        Parameters:
+        -----------
+        version_dir : str
+            缓存版本目录
+
+        Returns:
+        --------
+        Dict[str, Any]
+            序列化的数据，数据以延迟加载函数data_loader提供，首次访问模型数据时才读取文件
+        """
+        with open(os.path.join(version_dir, _META_FILE_NAME), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        for model_meta in meta.values():
+            model_meta['data'] = None
+            data_file = model_meta.get('data_file')
+            if not data_file:
+                continue
+
+            data_path = os.path.join(version_dir, data_file)
+            if not os.path.exists(data_path):
+                raise FileNotFoundError(f"缓存数据文件不存在: {data_path}")
+            if data_file.endswith(_FEATHER_SUFFIX):
+                if feather is None:
+                    raise ImportError("读取列式缓存需要安装pyarrow")
+                model_meta['data_loader'] = partial(feather.read_feather, data_path)
+            else:
+                model_meta['data_loader'] = partial(_load_cache, data_path)
+        return meta
+
     def _get_serializable_config(self, model) -> dict:
         """
         获取可序列化的配置信息
@@ -304,16 +714,11 @@ class DataCacheManager:
                 # 如果是字典，直接复制
                 config_info = config.copy()
         
-        # 获取列名配置
-        column_attrs = ['name_column', 'date_column', 'amount_column', 'balance_column', 
-                       'type_column', 'summary_column', 'remark_column', 'direction_column',
-                       'opposite_name_column', 'phone_column', 'duration_column', 
-                       'call_type_column', 'opposite_phone_column', 'opposite_location_column',
-                       'time_column', 'credit_flag', 'debit_flag']
-        
-        for attr in column_attrs:
+        # 获取列名配置；列名在各模型间大量重复，驻留后pickle可通过memo复用同一字符串
+        for attr in _COLUMN_ATTRS:
             if hasattr(model, attr):
-                config_info[attr] = getattr(model, attr)
+                value = getattr(model, attr)
+                config_info[attr] = sys.intern(value) if type(value) is str else value
         
         return config_info
     
@@ -365,8 +770,10 @@ class DataCacheManager:
             return None
             
         try:
-            with open(cache_file, 'rb') as f:
-                serialized_data = pickle.load(f)
+            if os.path.isdir(cache_file):
+                serialized_data = self._load_columnar_version(cache_file)
+            else:
+                serialized_data = _load_cache(cache_file)
             
             # 从序列化数据重建数据模型
             data_models = self._reconstruct_data_models(serialized_data)
@@ -401,18 +808,7 @@ class DataCacheManager:
         
         data_models = {}
         
-        # 导入必要的模型类
-        from src.datasource.bank_model import BankDataModel
-        from src.datasource.call_model import CallDataModel
-        from src.datasource.payment.alipay_model import AlipayDataModel
-        from src.datasource.payment.wechat_model import WeChatDataModel
-        
-        model_classes = {
-            'bank': BankDataModel,
-            'call': CallDataModel,
-            'alipay': AlipayDataModel,
-            'wechat': WeChatDataModel
-        }
+        model_classes = _MODEL_CLASSES
         
         for key, model_data in serialized_data.items():
             if key not in model_classes:
@@ -425,16 +821,21 @@ class DataCacheManager:
                 # 创建新的模型实例
                 model = model_class()
                 
-                # 恢复数据
-                if model_data.get('data') is not None:
+                # 恢复数据（列式缓存延迟到首次访问时读取）
+                if model_data.get('data_loader') is not None:
+                    model.set_data_loader(model_data['data_loader'])
+                elif model_data.get('data') is not None:
                     model.data = model_data['data']
                 
                 # 恢复文件路径
                 if model_data.get('file_path'):
                     model.file_path = model_data['file_path']
                 
-                # 恢复配置信息
-                config_info = model_data.get('config_info', {})
+                # 恢复配置信息（兼容配置单独pickle保存的旧缓存）
+                if model_data.get('config_info_pkl') is not None:
+                    config_info = pickle.loads(model_data['config_info_pkl'], fix_imports=False)
+                else:
+                    config_info = model_data.get('config_info', {})
                 if hasattr(model, 'config') and config_info:
                     # 如果模型有config属性，尝试恢复配置
                     if hasattr(model.config, 'update_from_dict'):
@@ -455,28 +856,6 @@ class DataCacheManager:
         
         return data_models
     
-    def clear_cache(self) -> bool:
-        """
-        清除缓存
-        
-        Returns:
-        --------
-        bool
-            清除是否成功
-        """
-        try:
-            if os.path.exists(self.data_cache_file):
-                os.remove(self.data_cache_file)
-            if os.path.exists(self.code_hash_file):
-                os.remove(self.code_hash_file)
-            
-            self.logger.info("缓存已清除")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"清除缓存失败: {e}")
-            return False
-    
     def get_available_cache_versions(self) -> List[Dict[str, Any]]:
         """
         获取所有可用的缓存版本
@@ -490,27 +869,41 @@ class DataCacheManager:
             if not os.path.exists(self.cache_dir):
                 return []
                 
-            cache_files = [f for f in os.listdir(self.cache_dir) 
-                          if f.startswith("data_models_") and f.endswith(".pkl")]
-            
             versions = []
-            for cache_file in cache_files:
-                file_path = os.path.join(self.cache_dir, cache_file)
-                
-                # 从文件名提取版本信息
-                version = cache_file.replace("data_models_", "").replace(".pkl", "")
-                
-                # 获取文件修改时间
-                mtime = os.path.getmtime(file_path)
-                size = os.path.getsize(file_path)
-                
-                versions.append({
-                    'version': version,
-                    'file_path': file_path,
-                    'timestamp': mtime,
-                    'size': size,
-                    'formatted_time': datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-                })
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("data_models_"):
+                        continue
+                    
+                    if entry.is_dir():
+                        # 列式缓存目录：以元数据文件为准，大小为目录内文件之和
+                        mtime = None
+                        size = 0
+                        with os.scandir(entry.path) as version_entries:
+                            for version_entry in version_entries:
+                                st = version_entry.stat()
+                                size += st.st_size
+                                if version_entry.name == _META_FILE_NAME:
+                                    mtime = st.st_mtime
+                        if mtime is None:
+                            continue
+                        version = entry.name[len("data_models_"):]
+                    elif entry.name.endswith(".pkl"):
+                        # 从文件名提取版本信息，一次stat同时获取修改时间和大小
+                        version = entry.name[len("data_models_"):-len(".pkl")]
+                        st = entry.stat()
+                        mtime = st.st_mtime
+                        size = st.st_size
+                    else:
+                        continue
+                    
+                    versions.append({
+                        'version': version,
+                        'file_path': entry.path,
+                        'timestamp': mtime,
+                        'size': size,
+                        'formatted_time': datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+                    })
             
             # 按时间戳排序
             versions.sort(key=lambda x: x['timestamp'])
@@ -3,12 +3,99 @@
 提供统一的存取现识别算法，支持基础和增强两种模式
 """
 
+import re
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 import logging
 
 
+# 合并文本列时的字段分隔符（ASCII单元分隔符，不会出现在关键词中）
+_FIELD_SEPARATOR = '\x1f'
+
+
+class _RecognitionOutput:
+    """一次识别过程的输出数组，各阶段直接写NumPy数组，识别结束后一次性写回DataFrame"""
+
+    def __init__(self, amount_abs: np.ndarray):
+        n_rows = len(amount_abs)
+        self.amount_abs = amount_abs
+        self.tags = np.full(n_rows, '转账', dtype=object)
+        self.confidence = np.zeros(n_rows)
+        # 识别原因按编码存储，编码到文本的对照表只保存少量不同的原因
+        self.reason_codes = np.zeros(n_rows, dtype=np.int16)
+        self.reason_table = ['']
+        self._reason_index = {'': 0}
+        # 置信度调整说明按位记录，写回时才拼接到识别原因后
+        self.adjust_flags = np.zeros(n_rows, dtype=np.uint8)
+        self.adjust_notes = []
+
+    def unrecognized(self) -> np.ndarray:
+        """仍为转账（尚未识别）的记录"""
+        return self.tags == '转账'
+
+    def _reason_code(self, reason: str) -> int:
+        """获取识别原因的编码，新原因追加到对照表"""
+        code = self._reason_index.get(reason)
+        if code is None:
+            code = len(self.reason_table)
+            self.reason_table.append(reason)
+            self._reason_index[reason] = code
+        return code
+
+    def _reason_codes_for(self, reasons) -> np.ndarray:
+        """将逐条识别原因数组转换为编码数组（只对不同取值查表）"""
+        unique_reasons, inverse = np.unique(reasons.astype(str), return_inverse=True)
+        codes = np.array([self._reason_code(reason) for reason in unique_reasons], dtype=self.reason_codes.dtype)
+        return codes[inverse]
+
+    def mark(self, mask, tag: str, confidence: Optional[float] = None, reason=None):
+        """将掩码命中的记录标记为存现/取现，并记录置信度与识别原因"""
+        rows = np.asarray(mask, dtype=bool)
+        self.tags[rows] = tag
+        if confidence is not None:
+            self.confidence[rows] = confidence
+        if isinstance(reason, str):
+            self.reason_codes[rows] = self._reason_code(reason)
+        elif reason is not None:
+            self.reason_codes[rows] = self._reason_codes_for(reason)
+
+    def adjust(self, mask: np.ndarray, factor: float, note: str):
+        """按比例调整命中记录的置信度，并标记需在识别原因后追加的说明"""
+        self.confidence[mask] *= factor
+        if note not in self.adjust_notes:
+            self.adjust_notes.append(note)
+        self.adjust_flags[mask] |= 1 << self.adjust_notes.index(note)
+
+    def reason_categorical(self) -> pd.Categorical:
+        """组合原因编码与调整标记，得到识别原因分类列（只对出现过的组合拼接文本）"""
+        if not self.adjust_notes:
+            return pd.Categorical.from_codes(self.reason_codes, categories=self.reason_table)
+        n_bits = len(self.adjust_notes)
+        combined = (self.reason_codes.astype(np.int32) << n_bits) | self.adjust_flags
+        combinations, inverse = np.unique(combined, return_inverse=True)
+        categories = [self.reason_table[combination >> n_bits] +
+                      ''.join(note for bit, note in enumerate(self.adjust_notes) if combination >> bit & 1)
+                      for combination in combinations]
+        return pd.Categorical.from_codes(inverse, categories=categories)
+
+    def write_to(self, data: pd.DataFrame, enhanced: bool):
+        """
+        将标识、置信度、原因及存取现金额写回DataFrame（整列替换，不原地修改共享内存）
+
+        收入金额、支出金额列不存在时总会创建（没有命中记录时为空值），下游分析依赖这两列
+        """
+        data['存取现标识'] = self.tags
+        if enhanced:
+            data['识别置信度'] = self.confidence
+            data['识别原因'] = self.reason_categorical()
+        for tag, amount_output_column in (('存现', '收入金额'), ('取现', '支出金额')):
+            rows = self.tags == tag
+            current = data[amount_output_column] if amount_output_column in data.columns else pd.Series(np.nan, index=data.index)
+            data[amount_output_column] = current.mask(rows, self.amount_abs) if rows.any() else current
+
+
 class CashRecognitionEngine:
     """存取现识别引擎"""
     
@@ -51,9 +138,73 @@ class CashRecognitionEngine:
         self.high_priority_deposit_keywords = self.config.get('analysis.cash.recognition.high_priority_deposit_keywords', [])
         self.high_priority_withdraw_keywords = self.config.get('analysis.cash.recognition.high_priority_withdraw_keywords', [])
 
+        # 预编译关键词正则
+        self._rebuild_patterns()
+
         # 验证配置加载情况
         self._validate_config()
 
+    @staticmethod
+    def _compile_keywords(keywords: List[str], capture: bool = False) -> Optional[re.Pattern]:
+        """
+        将关键词列表编译为正则，关键词为空时返回None
+
+        capture为True时整体作为前瞻捕获组：findall在每个位置都尝试匹配（不消耗字符），
+        可找出文本中出现的全部关键词，包括相互重叠的关键词。
+        关键词统一转小写且不带IGNORECASE，待匹配文本需事先转为小写
+        """
+        if not keywords:
+            return None
+        pattern = '|'.join(re.escape(keyword.lower()) for keyword in keywords)
+        if capture:
+            pattern = f'(?=({pattern}))'
+        return re.compile(pattern)
+
+    def _rebuild_patterns(self):
+        """根据当前关键词配置获取识别所用的正则等编译结果，相同关键词配置的引擎共享同一份"""
+        compiled = self._compile_patterns(
+            tuple(self.deposit_keywords or ()), tuple(self.deposit_exclude_keywords or ()),
+            tuple(self.withdraw_keywords or ()), tuple(self.withdraw_exclude_keywords or ()),
+            tuple(self.high_priority_deposit_keywords or ()), tuple(self.high_priority_withdraw_keywords or ()))
+        for name, value in compiled.items():
+            setattr(self, name, value)
+
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _compile_patterns(cls, deposit_keywords: Tuple[str, ...], deposit_exclude_keywords: Tuple[str, ...],
+                          withdraw_keywords: Tuple[str, ...], withdraw_exclude_keywords: Tuple[str, ...],
+                          high_priority_deposit_keywords: Tuple[str, ...],
+                          high_priority_withdraw_keywords: Tuple[str, ...]) -> Dict[str, object]:
+        """
+        编译识别所用的正则，按关键词配置缓存，重复创建引擎时不再重新编译
+
+        Returns:
+        --------
+        Dict[str, object]
+            属性名到编译结果的映射（结果在引擎间共享，只读使用）
+        """
+        return {
+            '_deposit_re': cls._compile_keywords(deposit_keywords),
+            '_deposit_excl_re': cls._compile_keywords(deposit_exclude_keywords),
+            '_withdraw_re': cls._compile_keywords(withdraw_keywords),
+            '_withdraw_excl_re': cls._compile_keywords(withdraw_exclude_keywords),
+            '_hp_deposit_re': cls._compile_keywords(high_priority_deposit_keywords, capture=True),
+            '_hp_withdraw_re': cls._compile_keywords(high_priority_withdraw_keywords, capture=True),
+            # 匹配文本（小写）到 (配置顺序, 配置关键词) 的映射，用于按配置顺序选取关键词并还原其写法
+            '_hp_deposit_lookup': cls._keyword_ranks(high_priority_deposit_keywords),
+            '_hp_withdraw_lookup': cls._keyword_ranks(high_priority_withdraw_keywords),
+            '_atm_re': re.compile('atm'),
+            '_fuzzy_cash_re': re.compile('现'),
+        }
+
+    @staticmethod
+    def _keyword_ranks(keywords: Tuple[str, ...]) -> Dict[str, Tuple[int, str]]:
+        """小写关键词到其在配置中首次出现的位置及原始写法的映射"""
+        ranks = {}
+        for rank, keyword in enumerate(keywords):
+            ranks.setdefault(keyword.lower(), (rank, keyword))
+        return ranks
+
     def _validate_config(self):
         """验证配置加载情况"""
         self.logger.info("=== 存取现识别配置验证 ===")
@@ -97,16 +248,8 @@ class CashRecognitionEngine:
         pd.DataFrame
             添加了存取现标识的数据
         """
-        # 复制数据避免修改原始数据
-        result_data = data.copy()
-        
-        # 初始化标识列
-        result_data['存取现标识'] = '转账'
-        
-        # 如果启用增强算法，添加额外字段
-        if self.enable_enhanced_algorithm:
-            result_data['识别置信度'] = 0.0
-            result_data['识别原因'] = ''
+        # 浅复制：识别结果以整列替换的方式写回，原始数据的列不会被修改
+        result_data = data.copy(deep=False)
         
         # 获取必要的列
         opposite_name_column = columns_config.get('opposite_name_column')
@@ -123,365 +266,247 @@ class CashRecognitionEngine:
         missing_columns = [col for col in required_columns if col not in result_data.columns]
         if missing_columns:
             self.logger.warning(f"缺少必要列: {missing_columns}")
+            _RecognitionOutput(np.zeros(len(result_data))).write_to(result_data, self.enable_enhanced_algorithm)
+            return result_data
+
+        # 关键词配置使各识别阶段都不会命中时，直接返回全部为转账的结果，省去文本列的构建与扫描
+        if self._recognition_is_noop():
+            if not self.enable_enhanced_algorithm:
+                self.logger.warning("存取现关键词配置为空，跳过识别")
+            _RecognitionOutput(np.zeros(len(result_data))).write_to(result_data, self.enable_enhanced_algorithm)
             return result_data
         
         # 构建对方姓名为空的掩码
         if opposite_name_column and opposite_name_column in result_data.columns:
-            empty_opposite_mask = result_data[opposite_name_column].isna() | \
-                                  (result_data[opposite_name_column].astype(str).str.strip() == '') | \
-                                  (result_data[opposite_name_column].astype(str).str.strip() == '\\N')
+            empty_opposite_mask = self._empty_name_flags(result_data[opposite_name_column].to_numpy())
         else:
             # 如果没有对方姓名字段，则所有记录都可能是存取现
-            empty_opposite_mask = pd.Series([True] * len(result_data), index=result_data.index)
+            empty_opposite_mask = np.ones(len(result_data), dtype=bool)
         
         # 获取相关列，并填充空值
-        summary_col = result_data[summary_column].astype(str).fillna('')
-        remark_col = result_data[remark_column].astype(str).fillna('')
-        type_col = result_data[type_column].astype(str).fillna('') if type_column and type_column in result_data.columns else pd.Series([''] * len(result_data))
+        summary_col = self._to_text(result_data[summary_column])
+        remark_col = self._to_text(result_data[remark_column])
+        type_col = self._to_text(result_data[type_column]) if type_column and type_column in result_data.columns else self._to_text(pd.Series('', index=result_data.index))
+
+        # 将摘要、备注、类型合并为一列，每个模式只需扫描一次；以单元分隔符连接，避免跨字段误匹配
+        text_col = summary_col.str.cat([remark_col, type_col], sep=_FIELD_SEPARATOR, na_rep='')
+        # 统一转小写一次：所有正则和字面串均按小写关键词构建，匹配时无需再做大小写折叠
+        text_col = text_col.str.lower()
+
+        # 各阶段共用的条件掩码只计算一次
+        income_mask, expense_mask = self._direction_flags(result_data[direction_column], income_flag, expense_flag)
+        ctx = {
+            'empty': empty_opposite_mask,
+            'income': income_mask,
+            'expense': expense_mask,
+            'deposit_exclude': self._contains(text_col, self._deposit_excl_re),
+            'withdraw_exclude': self._contains(text_col, self._withdraw_excl_re),
+        }
 
-        # 执行识别
+        # 执行识别：各阶段写入输出数组，最后一次性写回
+        output = _RecognitionOutput(result_data[amount_column].abs().to_numpy())
         if self.enable_enhanced_algorithm:
-            self._enhanced_recognition(result_data, empty_opposite_mask, summary_col, remark_col, type_col,
-                                     direction_column, amount_column, income_flag, expense_flag)
+            self._enhanced_recognition(ctx, output, text_col)
         else:
-            self._basic_recognition(result_data, empty_opposite_mask, summary_col, remark_col, type_col,
-                                  direction_column, amount_column, income_flag, expense_flag)
-        
+            self._basic_recognition(ctx, output, text_col)
+
+        output.write_to(result_data, self.enable_enhanced_algorithm)
         return result_data
     
-    def _basic_recognition(self, data: pd.DataFrame, empty_opposite_mask: pd.Series,
-                          summary_col: pd.Series, remark_col: pd.Series, type_col: pd.Series,
-                          direction_column: str, amount_column: str,
-                          income_flag: str, expense_flag: str):
+    def _recognition_is_noop(self) -> bool:
+        """判断当前配置下识别是否必然没有任何命中"""
+        # 基础识别与中优先级识别都要求存现、取现关键词均非空
+        if self.deposit_keywords and self.withdraw_keywords:
+            return False
+        if not self.enable_enhanced_algorithm:
+            return True
+        # 增强算法中，高优先级关键词和"现"字模糊匹配不依赖上述关键词
+        return not (self.high_priority_deposit_keywords or self.high_priority_withdraw_keywords
+                    or self.enable_fuzzy_matching)
+
+    @staticmethod
+    def _direction_flags(direction: pd.Series, income_flag: str, expense_flag: str) -> Tuple[np.ndarray, np.ndarray]:
+        """将借贷方向列编码为分类后按整数编码比较，得到收入、支出两个布尔数组"""
+        direction_cat = pd.Categorical(direction)
+        income_code, expense_code = direction_cat.categories.get_indexer([income_flag, expense_flag])
+        codes = direction_cat.codes
+        # 标识不在列中时编码为-1，不能与缺失值的编码-1比较
+        income_mask = codes == income_code if income_code >= 0 else np.zeros(len(codes), dtype=bool)
+        expense_mask = codes == expense_code if expense_code >= 0 else np.zeros(len(codes), dtype=bool)
+        return income_mask, expense_mask
+
+    @staticmethod
+    def _empty_name_flags(names: np.ndarray) -> np.ndarray:
+        """一次遍历判断对方姓名是否为空（缺失值、空白串或\\N）"""
+        def is_empty(name) -> bool:
+            if isinstance(name, str):
+                return name.strip() in ('', '\\N')
+            return pd.isna(name)
+
+        return np.fromiter((is_empty(name) for name in names), dtype=bool, count=len(names))
+
+    @staticmethod
+    def _to_text(column: pd.Series) -> pd.Series:
+        """将列转换为文本类型并填充空值"""
+        return column.astype(str).fillna('')
+
+    @staticmethod
+    def _contains(text_col: pd.Series, pattern: Optional[re.Pattern],
+                  rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        在文本列中查找预编译正则，返回布尔数组；正则为None（关键词为空）时全部为False
+
+        rows不为None时只扫描这些候选记录，其余位置为False
+        """
+        if pattern is None:
+            return np.zeros(len(text_col), dtype=bool)
+        if rows is None:
+            return text_col.str.contains(pattern, na=False).to_numpy(dtype=bool)
+        mask = np.zeros(len(text_col), dtype=bool)
+        if rows.any():
+            mask[rows] = text_col[rows].str.contains(pattern, na=False).to_numpy(dtype=bool)
+        return mask
+
+    def _basic_recognition(self, ctx: Dict[str, np.ndarray], output: '_RecognitionOutput', text_col: pd.Series):
         """基础识别算法"""
-        # 构建正则表达式模式
-        deposit_pattern = '|'.join(self.deposit_keywords) if self.deposit_keywords else ''
-        deposit_exclude_pattern = '|'.join(self.deposit_exclude_keywords) if self.deposit_exclude_keywords else ''
-        withdraw_pattern = '|'.join(self.withdraw_keywords) if self.withdraw_keywords else ''
-        withdraw_exclude_pattern = '|'.join(self.withdraw_exclude_keywords) if self.withdraw_exclude_keywords else ''
-        
-        if not deposit_pattern or not withdraw_pattern:
+        if self._deposit_re is None or self._withdraw_re is None:
             self.logger.warning("存取现关键词配置为空，跳过识别")
             return
         
         # 存现识别
-        deposit_mask = empty_opposite_mask & (
-            (summary_col.str.contains(deposit_pattern, case=False, na=False)) |
-            (remark_col.str.contains(deposit_pattern, case=False, na=False)) |
-            (type_col.str.contains(deposit_pattern, case=False, na=False))
-        ) & (data[direction_column] == income_flag)
-
-        if deposit_exclude_pattern:
-            deposit_mask = deposit_mask & ~(
-                (summary_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(deposit_exclude_pattern, case=False, na=False))
-            )
-
-        data.loc[deposit_mask, '存取现标识'] = '存现'
-        data.loc[deposit_mask, '收入金额'] = data.loc[deposit_mask, amount_column].abs()
+        deposit_mask = ctx['empty'] & ctx['income'] & ~ctx['deposit_exclude'] & self._contains(text_col, self._deposit_re)
+        output.mark(deposit_mask, '存现')
 
         # 取现识别
-        remaining_mask = ~deposit_mask & empty_opposite_mask
-        withdraw_mask = remaining_mask & (
-            (summary_col.str.contains(withdraw_pattern, case=False, na=False)) |
-            (remark_col.str.contains(withdraw_pattern, case=False, na=False)) |
-            (type_col.str.contains(withdraw_pattern, case=False, na=False))
-        ) & (data[direction_column] == expense_flag)
-
-        if withdraw_exclude_pattern:
-            withdraw_mask = withdraw_mask & ~(
-                (summary_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(withdraw_exclude_pattern, case=False, na=False))
-            )
-
-        data.loc[withdraw_mask, '存取现标识'] = '取现'
-        data.loc[withdraw_mask, '支出金额'] = data.loc[withdraw_mask, amount_column].abs()
+        remaining_mask = ~deposit_mask & ctx['empty']
+        withdraw_mask = remaining_mask & ctx['expense'] & ~ctx['withdraw_exclude'] & self._contains(text_col, self._withdraw_re)
+        output.mark(withdraw_mask, '取现')
     
-    def _enhanced_recognition(self, data: pd.DataFrame, empty_opposite_mask: pd.Series,
-                            summary_col: pd.Series, remark_col: pd.Series, type_col: pd.Series,
-                            direction_column: str, amount_column: str,
-                            income_flag: str, expense_flag: str):
+    def _enhanced_recognition(self, ctx: Dict[str, np.ndarray], output: '_RecognitionOutput', text_col: pd.Series):
         """增强识别算法"""
         # 1. 高优先级精确匹配
-        self._high_priority_recognition(data, empty_opposite_mask, summary_col, remark_col, type_col,
-                                      direction_column, amount_column, income_flag, expense_flag)
+        self._high_priority_recognition(ctx, output, text_col)
 
         # 2. 中优先级模糊匹配
-        self._medium_priority_recognition(data, empty_opposite_mask, summary_col, remark_col, type_col,
-                                        direction_column, amount_column, income_flag, expense_flag)
+        self._medium_priority_recognition(ctx, output, text_col)
 
         # 3. 低优先级上下文分析
         if self.enable_fuzzy_matching:
-            self._low_priority_recognition(data, empty_opposite_mask, summary_col, remark_col, type_col,
-                                         direction_column, amount_column, income_flag, expense_flag)
+            self._low_priority_recognition(ctx, output, text_col)
         
         # 4. 智能金额分析
         if self.enable_amount_analysis:
-            self._amount_based_analysis(data, amount_column)
+            self._amount_based_analysis(output)
     
-    def _high_priority_recognition(self, data: pd.DataFrame, empty_opposite_mask: pd.Series,
-                                 summary_col: pd.Series, remark_col: pd.Series, type_col: pd.Series,
-                                 direction_column: str, amount_column: str,
-                                 income_flag: str, expense_flag: str):
+    def _high_priority_recognition(self, ctx: Dict[str, np.ndarray], output: '_RecognitionOutput', text_col: pd.Series):
         """高优先级精确匹配识别（也需要排除转账）"""
-        # 构建排除模式
-        deposit_exclude_pattern = '|'.join(self.deposit_exclude_keywords) if self.deposit_exclude_keywords else ''
-        withdraw_exclude_pattern = '|'.join(self.withdraw_exclude_keywords) if self.withdraw_exclude_keywords else ''
-
-        # 存现高优先级匹配
-        for keyword in self.high_priority_deposit_keywords:
-            # 第1步：基础匹配（只处理未识别的转账）
-            base_mask = empty_opposite_mask & (
-                (summary_col.str.contains(keyword, case=False, na=False)) |
-                (remark_col.str.contains(keyword, case=False, na=False)) |
-                (type_col.str.contains(keyword, case=False, na=False))
-            ) & (data[direction_column] == income_flag) & (data['存取现标识'] == '转账')
-
-            # 第2步：排除转账
-            if deposit_exclude_pattern:
-                mask = base_mask & ~(
-                    (summary_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                    (remark_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                    (type_col.str.contains(deposit_exclude_pattern, case=False, na=False))
-                )
-            else:
-                mask = base_mask
-
-            if mask.any():
-                data.loc[mask, '存取现标识'] = '存现'
-                data.loc[mask, '收入金额'] = data.loc[mask, amount_column].abs()
-                data.loc[mask, '识别置信度'] = self.high_priority_confidence
-                data.loc[mask, '识别原因'] = f'高优先级关键词匹配: {keyword}'
+        # 存现高优先级匹配：基础匹配（只处理未识别的转账）并排除转账
+        if self._hp_deposit_re is not None:
+            deposit_base_mask = ctx['empty'] & ctx['income'] & output.unrecognized() & ~ctx['deposit_exclude']
+            mask, reasons = self._match_high_priority(text_col, deposit_base_mask, self._hp_deposit_re, self._hp_deposit_lookup)
+            output.mark(mask, '存现', self.high_priority_confidence, reasons)
 
         # 取现高优先级匹配
-        for keyword in self.high_priority_withdraw_keywords:
-            # 第1步：基础匹配
-            base_mask = empty_opposite_mask & (
-                (summary_col.str.contains(keyword, case=False, na=False)) |
-                (remark_col.str.contains(keyword, case=False, na=False)) |
-                (type_col.str.contains(keyword, case=False, na=False))
-            ) & (data[direction_column] == expense_flag) & (data['存取现标识'] == '转账')
-
-            # 第2步：排除转账
-            if withdraw_exclude_pattern:
-                mask = base_mask & ~(
-                    (summary_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                    (remark_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                    (type_col.str.contains(withdraw_exclude_pattern, case=False, na=False))
-                )
-            else:
-                mask = base_mask
-
-            if mask.any():
-                data.loc[mask, '存取现标识'] = '取现'
-                data.loc[mask, '支出金额'] = data.loc[mask, amount_column].abs()
-                data.loc[mask, '识别置信度'] = self.high_priority_confidence
-                data.loc[mask, '识别原因'] = f'高优先级关键词匹配: {keyword}'
-    
-    def _medium_priority_recognition(self, data: pd.DataFrame, empty_opposite_mask: pd.Series,
-                                   summary_col: pd.Series, remark_col: pd.Series, type_col: pd.Series,
-                                   direction_column: str, amount_column: str,
-                                   income_flag: str, expense_flag: str):
-        """中优先级识别：先过滤转账，再筛选存取现"""
-        # 构建正则表达式模式
-        deposit_pattern = '|'.join(self.deposit_keywords) if self.deposit_keywords else ''
-        deposit_exclude_pattern = '|'.join(self.deposit_exclude_keywords) if self.deposit_exclude_keywords else ''
-        withdraw_pattern = '|'.join(self.withdraw_keywords) if self.withdraw_keywords else ''
-        withdraw_exclude_pattern = '|'.join(self.withdraw_exclude_keywords) if self.withdraw_exclude_keywords else ''
+        if self._hp_withdraw_re is not None:
+            withdraw_base_mask = ctx['empty'] & ctx['expense'] & output.unrecognized() & ~ctx['withdraw_exclude']
+            mask, reasons = self._match_high_priority(text_col, withdraw_base_mask, self._hp_withdraw_re, self._hp_withdraw_lookup)
+            output.mark(mask, '取现', self.high_priority_confidence, reasons)
+
+    @staticmethod
+    def _match_high_priority(text_col: pd.Series, base_mask: np.ndarray, keyword_re: re.Pattern,
+                             lookup: Dict[str, Tuple[int, str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        用合并后的关键词正则一次性匹配高优先级关键词
+
+        一条记录包含多个关键词时，取配置中排在最前的关键词（与逐个关键词依次匹配的结果一致），
+        而不是文本中最先出现的关键词
 
-        if not deposit_pattern or not withdraw_pattern:
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            命中掩码，以及按顺序对应命中记录的识别原因
+        """
+        # 只对候选记录找出全部命中的关键词（按位置回填，不依赖索引唯一）
+        found = text_col[base_mask].str.findall(keyword_re).to_numpy()
+        hit = np.fromiter((bool(matches) for matches in found), dtype=bool, count=len(found))
+        mask = base_mask.copy()
+        mask[base_mask] = hit
+        reasons = np.array(['高优先级关键词匹配: ' + min(lookup[match] for match in matches)[1]
+                            for matches in found[hit]], dtype=object)
+        return mask, reasons
+
+    def _medium_priority_recognition(self, ctx: Dict[str, np.ndarray], output: '_RecognitionOutput', text_col: pd.Series):
+        """中优先级识别：先过滤转账，再筛选存取现"""
+        if self._deposit_re is None or self._withdraw_re is None:
             return
 
         # 存现识别：先过滤转账，再筛选存现关键词
-        # 第1步：基础条件筛选（对方姓名为空 + 借贷标识为贷）
-        deposit_base_mask = empty_opposite_mask & (data[direction_column] == income_flag) & (data['存取现标识'] == '转账')
-
-        # 第2步：过滤转账相关交易
-        if deposit_exclude_pattern:
-            deposit_candidate_mask = deposit_base_mask & ~(
-                (summary_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(deposit_exclude_pattern, case=False, na=False))
-            )
-        else:
-            deposit_candidate_mask = deposit_base_mask
-
-        # 第3步：从候选中筛选包含存现关键词的交易
-        deposit_mask = deposit_candidate_mask & (
-            (summary_col.str.contains(deposit_pattern, case=False, na=False)) |
-            (remark_col.str.contains(deposit_pattern, case=False, na=False)) |
-            (type_col.str.contains(deposit_pattern, case=False, na=False))
-        )
+        # 第1步：基础条件筛选（对方姓名为空 + 借贷标识为贷），并过滤转账相关交易
+        deposit_candidate_mask = ctx['empty'] & ctx['income'] & output.unrecognized() & ~ctx['deposit_exclude']
 
-        if deposit_mask.any():
-            data.loc[deposit_mask, '存取现标识'] = '存现'
-            data.loc[deposit_mask, '收入金额'] = data.loc[deposit_mask, amount_column].abs()
-            data.loc[deposit_mask, '识别置信度'] = self.medium_priority_confidence
-            data.loc[deposit_mask, '识别原因'] = '中优先级关键词匹配'
+        # 第2步：只在候选记录中筛选包含存现关键词的交易
+        deposit_mask = self._contains(text_col, self._deposit_re, deposit_candidate_mask)
+        output.mark(deposit_mask, '存现', self.medium_priority_confidence, '中优先级关键词匹配')
 
         # 取现识别：先过滤转账，再筛选取现关键词
-        # 第1步：基础条件筛选（对方姓名为空 + 借贷标识为借）
-        withdraw_base_mask = empty_opposite_mask & (data[direction_column] == expense_flag) & (data['存取现标识'] == '转账')
-
-        # 第2步：过滤转账相关交易
-        if withdraw_exclude_pattern:
-            withdraw_candidate_mask = withdraw_base_mask & ~(
-                (summary_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(withdraw_exclude_pattern, case=False, na=False))
-            )
-        else:
-            withdraw_candidate_mask = withdraw_base_mask
-
-        # 第3步：从候选中筛选包含取现关键词的交易
-        withdraw_mask = withdraw_candidate_mask & (
-            (summary_col.str.contains(withdraw_pattern, case=False, na=False)) |
-            (remark_col.str.contains(withdraw_pattern, case=False, na=False)) |
-            (type_col.str.contains(withdraw_pattern, case=False, na=False))
-        )
-
-        if withdraw_mask.any():
-            data.loc[withdraw_mask, '存取现标识'] = '取现'
-            data.loc[withdraw_mask, '支出金额'] = data.loc[withdraw_mask, amount_column].abs()
-            data.loc[withdraw_mask, '识别置信度'] = self.medium_priority_confidence
-            data.loc[withdraw_mask, '识别原因'] = '中优先级关键词匹配'
-
-        # ATM智能识别：先过滤转账，再识别ATM存取现
-        self._atm_smart_recognition(data, empty_opposite_mask, summary_col, remark_col, type_col,
-                                  direction_column, amount_column, income_flag, expense_flag,
-                                  deposit_exclude_pattern, withdraw_exclude_pattern)
-
-    def _atm_smart_recognition(self, data: pd.DataFrame, empty_opposite_mask: pd.Series,
-                             summary_col: pd.Series, remark_col: pd.Series, type_col: pd.Series,
-                             direction_column: str, amount_column: str,
-                             income_flag: str, expense_flag: str,
-                             deposit_exclude_pattern: str, withdraw_exclude_pattern: str):
-        """ATM智能识别：先过滤转账，再识别ATM存取现"""
-
-        # ATM存现识别：先过滤转账，再筛选ATM
-        # 第1步：基础条件筛选（对方姓名为空 + 借贷标识为贷）
-        atm_deposit_base_mask = empty_opposite_mask & (data[direction_column] == income_flag) & (data['存取现标识'] == '转账')
-
-        # 第2步：过滤转账相关交易
-        if deposit_exclude_pattern:
-            atm_deposit_candidate_mask = atm_deposit_base_mask & ~(
-                (summary_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(deposit_exclude_pattern, case=False, na=False))
-            )
-        else:
-            atm_deposit_candidate_mask = atm_deposit_base_mask
-
-        # 第3步：从候选中筛选包含ATM的交易
-        atm_deposit_mask = atm_deposit_candidate_mask & (
-            (summary_col.str.contains('ATM', case=False, na=False)) |
-            (remark_col.str.contains('ATM', case=False, na=False)) |
-            (type_col.str.contains('ATM', case=False, na=False))
-        )
-
-        if atm_deposit_mask.any():
-            data.loc[atm_deposit_mask, '存取现标识'] = '存现'
-            data.loc[atm_deposit_mask, '收入金额'] = data.loc[atm_deposit_mask, amount_column].abs()
-            data.loc[atm_deposit_mask, '识别置信度'] = self.medium_priority_confidence
-            data.loc[atm_deposit_mask, '识别原因'] = 'ATM智能识别-存现'
-
-        # ATM取现识别：先过滤转账，再筛选ATM
-        # 第1步：基础条件筛选（对方姓名为空 + 借贷标识为借）
-        atm_withdraw_base_mask = empty_opposite_mask & (data[direction_column] == expense_flag) & (data['存取现标识'] == '转账')
-
-        # 第2步：过滤转账相关交易
-        if withdraw_exclude_pattern:
-            atm_withdraw_candidate_mask = atm_withdraw_base_mask & ~(
-                (summary_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(withdraw_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(withdraw_exclude_pattern, case=False, na=False))
-            )
-        else:
-            atm_withdraw_candidate_mask = atm_withdraw_base_mask
-
-        # 第3步：从候选中筛选包含ATM的交易
-        atm_withdraw_mask = atm_withdraw_candidate_mask & (
-            (summary_col.str.contains('ATM', case=False, na=False)) |
-            (remark_col.str.contains('ATM', case=False, na=False)) |
-            (type_col.str.contains('ATM', case=False, na=False))
-        )
-
-        if atm_withdraw_mask.any():
-            data.loc[atm_withdraw_mask, '存取现标识'] = '取现'
-            data.loc[atm_withdraw_mask, '支出金额'] = data.loc[atm_withdraw_mask, amount_column].abs()
-            data.loc[atm_withdraw_mask, '识别置信度'] = self.medium_priority_confidence
-            data.loc[atm_withdraw_mask, '识别原因'] = 'ATM智能识别-取现'
-
-    def _low_priority_recognition(self, data: pd.DataFrame, empty_opposite_mask: pd.Series,
-                                summary_col: pd.Series, remark_col: pd.Series, type_col: pd.Series,
-                                direction_column: str, amount_column: str,
-                                income_flag: str, expense_flag: str):
-        """低优先级上下文分析识别"""
-        # 构建排除模式
-        deposit_exclude_pattern = '|'.join(self.deposit_exclude_keywords) if self.deposit_exclude_keywords else ''
-        withdraw_exclude_pattern = '|'.join(self.withdraw_exclude_keywords) if self.withdraw_exclude_keywords else ''
+        # 第1步：基础条件筛选（对方姓名为空 + 借贷标识为借），并过滤转账相关交易
+        withdraw_candidate_mask = ctx['empty'] & ctx['expense'] & output.unrecognized() & ~ctx['withdraw_exclude']
+
+        # 第2步：只在候选记录中筛选包含取现关键词的交易
+        withdraw_mask = self._contains(text_col, self._withdraw_re, withdraw_candidate_mask)
+        output.mark(withdraw_mask, '取现', self.medium_priority_confidence, '中优先级关键词匹配')
+
+        # ATM智能识别：候选条件与上面相同，只需剔除刚识别的记录
+        self._atm_smart_recognition(output, text_col,
+                                  deposit_candidate_mask & ~deposit_mask,
+                                  withdraw_candidate_mask & ~withdraw_mask)
+
+    def _atm_smart_recognition(self, output: '_RecognitionOutput', text_col: pd.Series,
+                             atm_deposit_candidate_mask: np.ndarray, atm_withdraw_candidate_mask: np.ndarray):
+        """ATM智能识别：在已过滤转账的候选记录中识别ATM存取现"""
+        # 只在候选记录上查找一次ATM（文本已转小写），存现与取现共用
+        atm_mask = self._contains(text_col, self._atm_re, atm_deposit_candidate_mask | atm_withdraw_candidate_mask)
+
+        # ATM存现识别
+        atm_deposit_mask = atm_deposit_candidate_mask & atm_mask
+        output.mark(atm_deposit_mask, '存现', self.medium_priority_confidence, 'ATM智能识别-存现')
 
+        # ATM取现识别
+        atm_withdraw_mask = atm_withdraw_candidate_mask & atm_mask
+        output.mark(atm_withdraw_mask, '取现', self.medium_priority_confidence, 'ATM智能识别-取现')
+
+    def _low_priority_recognition(self, ctx: Dict[str, np.ndarray], output: '_RecognitionOutput', text_col: pd.Series):
+        """低优先级上下文分析识别"""
         # 基于金额特征的识别（整数金额更可能是存取现）
-        round_amount_conditions = []
+        abs_amount = output.amount_abs
+        round_amount_mask = np.zeros(len(abs_amount), dtype=bool)
         for modulo in self.round_amount_modulos:
-            round_amount_conditions.append(data[amount_column].abs() % modulo == 0)
-        round_amount_mask = pd.concat(round_amount_conditions, axis=1).any(axis=1) if round_amount_conditions else pd.Series([False] * len(data))
+            np.logical_or(round_amount_mask, abs_amount % modulo == 0, out=round_amount_mask)
 
         # 基于金额范围的识别（常见存取现金额范围）
-        amount_mask = data[amount_column].abs().isin(self.common_cash_amounts) if self.common_cash_amounts else pd.Series([False] * len(data))
-
-        # 模糊匹配：包含"现"字但不在排除列表中
-        base_fuzzy_mask = empty_opposite_mask & (
-            (summary_col.str.contains('现', case=False, na=False)) |
-            (remark_col.str.contains('现', case=False, na=False)) |
-            (type_col.str.contains('现', case=False, na=False))
-        ) & (data['存取现标识'] == '转账')
-
-        # 排除转账相关交易（这是关键修复）
-        if deposit_exclude_pattern:
-            fuzzy_cash_mask = base_fuzzy_mask & ~(
-                (summary_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (remark_col.str.contains(deposit_exclude_pattern, case=False, na=False)) |
-                (type_col.str.contains(deposit_exclude_pattern, case=False, na=False))
-            )
-        else:
-            fuzzy_cash_mask = base_fuzzy_mask
+        amount_mask = np.isin(abs_amount, self.common_cash_amounts) if self.common_cash_amounts else np.zeros(len(abs_amount), dtype=bool)
+
+        # 模糊匹配：包含"现"字但不在排除列表中（排除转账相关交易是关键修复），只扫描满足其余条件的记录
+        fuzzy_candidate_mask = ctx['empty'] & output.unrecognized() & ~ctx['deposit_exclude'] & (round_amount_mask | amount_mask)
+        fuzzy_cash_mask = self._contains(text_col, self._fuzzy_cash_re, fuzzy_candidate_mask)
 
         # 存现模糊匹配
-        fuzzy_deposit_mask = fuzzy_cash_mask & (data[direction_column] == income_flag) & (round_amount_mask | amount_mask)
-        if fuzzy_deposit_mask.any():
-            data.loc[fuzzy_deposit_mask, '存取现标识'] = '存现'
-            data.loc[fuzzy_deposit_mask, '收入金额'] = data.loc[fuzzy_deposit_mask, amount_column].abs()
-            data.loc[fuzzy_deposit_mask, '识别置信度'] = self.low_priority_confidence
-            data.loc[fuzzy_deposit_mask, '识别原因'] = '低优先级上下文分析'
+        output.mark(fuzzy_cash_mask & ctx['income'], '存现', self.low_priority_confidence, '低优先级上下文分析')
 
         # 取现模糊匹配
-        fuzzy_withdraw_mask = fuzzy_cash_mask & (data[direction_column] == expense_flag) & (round_amount_mask | amount_mask)
-        if fuzzy_withdraw_mask.any():
-            data.loc[fuzzy_withdraw_mask, '存取现标识'] = '取现'
-            data.loc[fuzzy_withdraw_mask, '支出金额'] = data.loc[fuzzy_withdraw_mask, amount_column].abs()
-            data.loc[fuzzy_withdraw_mask, '识别置信度'] = self.low_priority_confidence
-            data.loc[fuzzy_withdraw_mask, '识别原因'] = '低优先级上下文分析'
-
-    def _amount_based_analysis(self, data: pd.DataFrame, amount_column: str):
-        """基于金额的智能分析"""
-        # 异常大额存取现（可能是误识别）
-        large_amount_mask = (data['存取现标识'].isin(['存现', '取现'])) & (data[amount_column].abs() > self.large_amount_threshold)
+        output.mark(fuzzy_cash_mask & ctx['expense'], '取现', self.low_priority_confidence, '低优先级上下文分析')
 
-        if large_amount_mask.any():
-            # 降低大额交易的置信度
-            data.loc[large_amount_mask, '识别置信度'] *= 0.8
-            data.loc[large_amount_mask, '识别原因'] += ' (大额交易置信度调整)'
+    def _amount_based_analysis(self, output: '_RecognitionOutput'):
+        """基于金额的智能分析"""
+        cash_mask = output.tags != '转账'
 
-        # 小额存取现（可能是找零或测试）
-        small_amount_mask = (data['存取现标识'].isin(['存现', '取现'])) & (data[amount_column].abs() < self.small_amount_threshold)
+        # 异常大额存取现（可能是误识别），降低置信度
+        large_amount_mask = cash_mask & (output.amount_abs > self.large_amount_threshold)
+        output.adjust(large_amount_mask, 0.8, ' (大额交易置信度调整)')
 
-        if small_amount_mask.any():
-            # 降低小额交易的置信度
-            data.loc[small_amount_mask, '识别置信度'] *= 0.7
-            data.loc[small_amount_mask, '识别原因'] += ' (小额交易置信度调整)'
+        # 小额存取现（可能是找零或测试），降低置信度
+        small_amount_mask = cash_mask & (output.amount_abs < self.small_amount_threshold)
+        output.adjust(small_amount_mask, 0.7, ' (小额交易置信度调整)')
 
     def get_recognition_stats(self, data: pd.DataFrame) -> Dict[str, any]:
         """
@@ -497,19 +522,25 @@ class CashRecognitionEngine:
         Dict[str, any]
             识别统计信息
         """
+        # 一次计数得到各类记录数
+        tag_counts = data['存取现标识'].value_counts()
         stats = {
             '总记录数': len(data),
-            '存现记录数': len(data[data['存取现标识'] == '存现']),
-            '取现记录数': len(data[data['存取现标识'] == '取现']),
-            '转账记录数': len(data[data['存取现标识'] == '转账']),
+            '存现记录数': int(tag_counts.get('存现', 0)),
+            '取现记录数': int(tag_counts.get('取现', 0)),
+            '转账记录数': int(tag_counts.get('转账', 0)),
         }
 
         if self.enable_enhanced_algorithm and '识别置信度' in data.columns:
-            cash_data = data[data['存取现标识'].isin(['存现', '取现'])]
-            if not cash_data.empty:
-                stats['平均置信度'] = cash_data['识别置信度'].mean()
-                stats['高置信度记录数'] = len(cash_data[cash_data['识别置信度'] >= 0.8])
-                stats['中置信度记录数'] = len(cash_data[(cash_data['识别置信度'] >= 0.6) & (cash_data['识别置信度'] < 0.8)])
-                stats['低置信度记录数'] = len(cash_data[cash_data['识别置信度'] < 0.6])
+            cash_mask = data['存取现标识'].isin(['存现', '取现']).to_numpy()
+            if cash_mask.any():
+                confidence = data['识别置信度'].to_numpy()[cash_mask]
+                stats['平均置信度'] = confidence.mean()
+                # 一次分箱统计低/中/高置信度记录数：[-inf, 0.6)、[0.6, 0.8)、[0.8, inf)
+                low_count, medium_count, high_count = np.bincount(
+                    np.searchsorted([0.6, 0.8], confidence, side='right'), minlength=3)
+                stats['高置信度记录数'] = int(high_count)
+                stats['中置信度记录数'] = int(medium_count)
+                stats['低置信度记录数'] = int(low_count)
 
         return stats
@@ -1,16 +1,252 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import copy
 import json
 import os
 import logging
 import time
 import threading
-from typing import Dict, Any, Optional, Callable, List
+import weakref
+import inspect
+import zlib
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, List, Mapping
 from datetime import datetime
 
 from src.utils.exceptions import ConfigError
-from src.utils.constants import FilePath
+from src.utils.constants import FilePath, ColumnName, DirectionFlag, DataSourceType
+
+# 可选：使用watchdog监听配置文件变化（inotify/FSEvents/ReadDirectoryChangesW），无需轮询
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+# 可选：使用orjson（C实现）解析配置文件，不可用时退回标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(raw: bytes) -> Dict[str, Any]:
+    """解析UTF-8编码的配置文件内容"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def _dumps(config: Dict[str, Any]) -> bytes:
+    """
+    将配置序列化为4空格缩进的UTF-8字节串
+    
+    写入始终使用标准库json：orjson只支持2空格缩进，配置文件格式不应随可选依赖变化
+    """
+    return json.dumps(config, ensure_ascii=False, indent=4).encode('utf-8')
+
+
+# Config.get 结果缓存的最大条目数
+_GET_CACHE_SIZE = 512
+
+# 区分"键不存在"与"值为None"的哨兵对象
+_SENTINEL = object()
+
+# 点分隔键拆分结果缓存（与配置内容无关，无需失效）
+_SPLIT_CACHE: Dict[str, tuple] = {}
+_SPLIT_CACHE_SIZE = 1024
+
+
+def _parse_version(version: Any) -> Optional[tuple]:
+    """将"1.2.0"形式的版本号解析为整数元组，无法解析时返回None"""
+    try:
+        return tuple(int(part) for part in str(version).split('.'))
+    except ValueError:
+        return None
+
+
+def _split(key: str) -> tuple:
+    """拆分点分隔的配置键，结果按键缓存"""
+    keys = _SPLIT_CACHE.get(key)
+    if keys is None:
+        keys = tuple(key.split('.'))
+        if len(_SPLIT_CACHE) >= _SPLIT_CACHE_SIZE:
+            _SPLIT_CACHE.pop(next(iter(_SPLIT_CACHE)))
+        _SPLIT_CACHE[key] = keys
+    return keys
+
+
+# 默认配置模板，模块加载时只构建一次；meta.last_updated 在生成副本时填写
+_DEFAULT_CONFIG_TEMPLATE = {
+    # 配置元数据
+    "meta": {
+        "version": "1.0.0",
+        "description": "应用配置文件"
+    },
+    
+    # 数据源配置
+    'data_sources': {
+        DataSourceType.BANK.value: {
+            'name_column': ColumnName.NAME.value,
+            'date_column': ColumnName.DATE.value,
+            'time_column': '交易时间',
+            'amount_column': ColumnName.AMOUNT.value,
+            'balance_column': ColumnName.BALANCE.value,
+            'type_column': '交易类型',
+            'direction_column': ColumnName.DIRECTION.value,
+            'opposite_name_column': ColumnName.OPPOSITE_NAME.value,
+            'special_date_column': ColumnName.SPECIAL_DATE.value,
+            'summary_column': ColumnName.SUMMARY.value,
+            'remark_column': ColumnName.REMARK.value,
+            'bank_name_column': ColumnName.BANK_NAME.value,
+            'account_column': '本方账号',
+            'card_number_column': '本方卡号',
+            'opposite_account_column': '对方账号',
+            'opposite_card_column': '对方卡号',
+            'opposite_bank_column': '对方银行名称',
+            'opposite_unit_column': '对方单位',
+            'opposite_title_column': '对方职位',
+            'social_relation_column': '社会关系',
+            'transaction_address_column': '交易地址',
+            'remark_column_2': '标记备注',
+            'credit_flag': DirectionFlag.BANK_CREDIT,  # 贷方（收入）标识
+            'debit_flag': DirectionFlag.BANK_DEBIT,   # 借方（支出）标识
+            'income_flag': DirectionFlag.BANK_CREDIT,    # 收入
+            'expense_flag': DirectionFlag.BANK_DEBIT,   # 支出
+        },
+        DataSourceType.CALL.value: {
+            'name_column': ColumnName.NAME.value,
+            'date_column': '呼叫日期',
+            'time_column': '时间',
+            'duration_column': '通话时长',
+            'opposite_name_column': ColumnName.OPPOSITE_NAME.value,
+            'opposite_number_column': ColumnName.OPPOSITE_NUMBER.value,
+            'opposite_unit_column': '对方单位名称',
+            'opposite_title_column': '对方职务',
+            'call_type_column': ColumnName.CALL_TYPE.value,
+            'special_date_column': ColumnName.SPECIAL_DATE.value,
+            'call_in_flag': '被叫',   # 被叫标识
+            'call_out_flag': '主叫',  # 主叫标识
+            'sms_flag': '短信',       # 短信标识
+            'id_card_column': '本方身份证号',
+            'number_column': '本方号码',
+            'opposite_id_card_column': '对方身份证号',
+            'location_column': '通话所在地',
+            'address_column': '通话地址',
+            'social_relation_column': '社会关系',
+            'remark_column': '标记备注',
+        },
+        DataSourceType.WECHAT.value: {
+            'name_column': ColumnName.NAME.value,
+            'account_column': '本方微信账号',
+            'date_column': ColumnName.DATE.value,
+            'time_column': '交易时间',
+            'amount_column': ColumnName.AMOUNT.value,
+            'balance_column': ColumnName.BALANCE.value,
+            'type_column': '交易类型',
+            'direction_column': ColumnName.DIRECTION.value,
+            'opposite_name_column': ColumnName.OPPOSITE_NAME.value,
+            'opposite_account_column': '对方微信账号',
+            'opposite_nickname_column': '对方微信昵称',
+            'special_date_column': ColumnName.SPECIAL_DATE.value,
+            'description_column': '交易说明',
+            'payment_method_column': '支付方式',
+            'merchant_name_column': '商户名称',
+            'phone_column': '关联手机号码',
+            'social_relation_column': '社会关系',
+            'remark_column': '标记备注',
+            'remark_column_2': ColumnName.REMARK.value,
+            'credit_flag': DirectionFlag.WECHAT_CREDIT,  # 收入标识
+            'debit_flag': DirectionFlag.WECHAT_DEBIT,   # 支出标识
+        },
+        DataSourceType.ALIPAY.value: {
+            'name_column': ColumnName.NAME.value,
+            'account_column': '本方账号',
+            'date_column': ColumnName.DATE.value,
+            'time_column': '交易时间',
+            'amount_column': ColumnName.AMOUNT.value,
+            'type_column': '交易类型',
+            'direction_column': ColumnName.DIRECTION.value,
+            'opposite_name_column': ColumnName.OPPOSITE_NAME.value,
+            'opposite_account_column': '对方账号',
+            'special_date_column': ColumnName.SPECIAL_DATE.value,
+            'transaction_type_column': '交易类型',
+            'remark_column': ColumnName.REMARK.value,
+            'transaction_status_column': '交易状态',
+            'payment_method_column': '支付方式',
+            'product_name_column': '交易商品名称',
+            'phone_column': '关联手机号码',
+            'address_column': '注册地址',
+            'social_relation_column': '社会关系',
+            'remark_column_2': '标记备注',
+            'credit_flag': DirectionFlag.ALIPAY_CREDIT,  # 收入标识
+            'debit_flag': DirectionFlag.ALIPAY_DEBIT,   # 支出标识
+        }
+    },
+    
+    # 分析配置
+    'analysis': {
+        'bank': {
+            'deposit_keywords': ['存', '现金存', '柜台存', '存款', '现金存入', '存现'],
+            'withdraw_keywords': ['取', '现金取', '柜台取', 'ATM取', '取款', '现金支取', '取现'],
+            'deposit_exclude_keywords': ['转存', '存息', '利息存入'],
+        },
+        'special_date': {
+            'keywords': ['节日', '假期', '周末', '春节', '中秋', '元旦', '重阳', '清明', '国庆'],
+        }
+    },
+    
+    # 导出配置
+    'export': {
+        'default_output_dir': 'output',
+        'report_template': 'templates/report_template.docx',
+        'excel': {
+            'conditional_formatting': True,
+            'auto_filter': True,
+            'freeze_panes': True,
+            'default_width': 15
+        },
+        'word': {
+            'title_style': 'Heading 1',
+            'subtitle_style': 'Heading 2',
+            'table_style': 'Table Grid',
+            'include_toc': True
+        }
+    },
+    
+    # 应用配置
+    'app': {
+        'log_level': 'INFO',
+        'log_file': 'logs/app.log',
+        'config_auto_reload': False,
+        'config_reload_interval': 60  # 秒
+    }
+}
+
+
+def _fresh_default_config() -> Dict[str, Any]:
+    """返回默认配置的深拷贝，并填写最后更新时间"""
+    config = copy.deepcopy(_DEFAULT_CONFIG_TEMPLATE)
+    config["meta"]["last_updated"] = datetime.now().isoformat()
+    return config
+
+
+class _ConfigFileChangeHandler(FileSystemEventHandler):
+    """配置文件变化时重新加载配置并通知观察者"""
+    
+    def __init__(self, config: 'Config'):
+        super().__init__()
+        self.config = config
+        self.config_path = os.path.abspath(config.config_file)
+    
+    def on_any_event(self, event):
+        # 编辑器常以"写临时文件再重命名"的方式保存，因此同时检查目标路径
+        paths = (getattr(event, 'src_path', None), getattr(event, 'dest_path', None))
+        if any(path and os.path.abspath(path) == self.config_path for path in paths):
+            self.config._reload_if_modified()
+
 
 class Config:
     """
@@ -30,162 +266,30 @@ class Config:
         self.config_file = config_file or FilePath.CONFIG
         self.config = {}
         self.last_modified_time = 0
+        # 上次加载/保存时配置文件的 (修改时间, 大小) 与内容CRC32，用于跳过未实际变化的重新加载
+        self._file_state = None
+        self._content_crc = None
+        
+        # 点分隔键的查询结果缓存，配置变更时清空；代数随每次清空递增，
+        # 不加锁的get据此丢弃在清空前按旧配置算出的结果
+        self._get_cache: Dict[str, Any] = {}
+        self._cache_gen = 0
         
-        # 配置观察者列表
-        self._observers = []
+        # 保护配置的修改操作（加载、保存、设置、重置）；可重入，load内部会调用save/_upgrade_config
+        self._lock = threading.RLock()
         
-        # 热加载相关
+        # 配置观察者列表：绑定方法以WeakMethod保存，不延长其所属对象的生命周期；
+        # 普通函数（可能是调用方临时定义的闭包）仍直接保存
+        self._observers: List[Any] = []
+        
+        # 热加载相关（优先使用watchdog，不可用时退回轮询线程）
+        self._observer = None
         self._watch_thread = None
         self._stop_watching = threading.Event()
         self._watch_interval = 5  # 检查间隔，秒
         
-        # 默认配置
-        self.default_config = {
-            # 配置元数据
-            "meta": {
-                "version": "1.0.0",
-                "last_updated": datetime.now().isoformat(),
-                "description": "应用配置文件"
-            },
-            
-            # 数据源配置
-            'data_sources': {
-                'bank': {
-                    'name_column': '本方姓名',
-                    'date_column': '交易日期',
-                    'time_column': '交易时间',
-                    'amount_column': '交易金额',
-                    'balance_column': '账户余额',
-                    'type_column': '交易类型',
-                    'direction_column': '借贷标识',
-                    'opposite_name_column': '对方姓名',
-                    'special_date_column': '特殊日期名称',
-                    'summary_column': '交易摘要',
-                    'remark_column': '交易备注',
-                    'bank_name_column': '银行类型',
-                    'account_column': '本方账号',
-                    'card_number_column': '本方卡号',
-                    'opposite_account_column': '对方账号',
-                    'opposite_card_column': '对方卡号',
-                    'opposite_bank_column': '对方银行名称',
-                    'opposite_unit_column': '对方单位',
-                    'opposite_title_column': '对方职位',
-                    'social_relation_column': '社会关系',
-                    'transaction_address_column': '交易地址',
-                    'remark_column_2': '标记备注',
-                    'credit_flag': '贷',  # 贷方（收入）标识
-                    'debit_flag': '借',   # 借方（支出）标识
-                    'income_flag': '贷',    # 收入
-                    'expense_flag': '借',   # 支出
-                },
-                'call': {
-                    'name_column': '本方姓名',
-                    'date_column': '呼叫日期',
-                    'time_column': '时间',
-                    'duration_column': '通话时长',
-                    'opposite_name_column': '对方姓名',
-                    'opposite_number_column': '对方号码',
-                    'opposite_unit_column': '对方单位名称',
-                    'opposite_title_column': '对方职务',
-                    'call_type_column': '呼叫类型',
-                    'special_date_column': '特殊日期名称',
-                    'call_in_flag': '被叫',   # 被叫标识
-                    'call_out_flag': '主叫',  # 主叫标识
-                    'sms_flag': '短信',       # 短信标识
-                    'id_card_column': '本方身份证号',
-                    'number_column': '本方号码',
-                    'opposite_id_card_column': '对方身份证号',
-                    'location_column': '通话所在地',
-                    'address_column': '通话地址',
-                    'social_relation_column': '社会关系',
-                    'remark_column': '标记备注',
-                },
-                'wechat': {
-                    'name_column': '本方姓名',
-                    'account_column': '本方微信账号',
-                    'date_column': '交易日期',
-                    'time_column': '交易时间',
-                    'amount_column': '交易金额',
-                    'balance_column': '账户余额',
-                    'type_column': '交易类型',
-                    'direction_column': '借贷标识',
-                    'opposite_name_column': '对方姓名',
-                    'opposite_account_column': '对方微信账号',
-                    'opposite_nickname_column': '对方微信昵称',
-                    'special_date_column': '特殊日期名称',
-                    'description_column': '交易说明',
-                    'payment_method_column': '支付方式',
-                    'merchant_name_column': '商户名称',
-                    'phone_column': '关联手机号码',
-                    'social_relation_column': '社会关系',
-                    'remark_column': '标记备注',
-                    'remark_column_2': '交易备注',
-                    'credit_flag': '入',  # 收入标识
-                    'debit_flag': '出',   # 支出标识
-                },
-                'alipay': {
-                    'name_column': '本方姓名',
-                    'account_column': '本方账号',
-                    'date_column': '交易日期',
-                    'time_column': '交易时间',
-                    'amount_column': '交易金额',
-                    'type_column': '交易类型',
-                    'direction_column': '借贷标识',
-                    'opposite_name_column': '对方姓名',
-                    'opposite_account_column': '对方账号',
-                    'special_date_column': '特殊日期名称',
-                    'transaction_type_column': '交易类型',
-                    'remark_column': '交易备注',
-                    'transaction_status_column': '交易状态',
-                    'payment_method_column': '支付方式',
-                    'product_name_column': '交易商品名称',
-                    'phone_column': '关联手机号码',
-                    'address_column': '注册地址',
-                    'social_relation_column': '社会关系',
-                    'remark_column_2': '标记备注',
-                    'credit_flag': '收入',  # 收入标识
-                    'debit_flag': '支出',   # 支出标识
-                }
-            },
-            
-            # 分析配置
-            'analysis': {
-                'bank': {
-                    'deposit_keywords': ['存', '现金存', '柜台存', '存款', '现金存入', '存现'],
-                    'withdraw_keywords': ['取', '现金取', '柜台取', 'ATM取', '取款', '现金支取', '取现'],
-                    'deposit_exclude_keywords': ['转存', '存息', '利息存入'],
-                },
-                'special_date': {
-                    'keywords': ['节日', '假期', '周末', '春节', '中秋', '元旦', '重阳', '清明', '国庆'],
-                }
-            },
-            
-            # 导出配置
-            'export': {
-                'default_output_dir': 'output',
-                'report_template': 'templates/report_template.docx',
-                'excel': {
-                    'conditional_formatting': True,
-                    'auto_filter': True,
-                    'freeze_panes': True,
-                    'default_width': 15
-                },
-                'word': {
-                    'title_style': 'Heading 1',
-                    'subtitle_style': 'Heading 2',
-                    'table_style': 'Table Grid',
-                    'include_toc': True
-                }
-            },
-            
-            # 应用配置
-            'app': {
-                'log_level': 'INFO',
-                'log_file': 'logs/app.log',
-                'config_auto_reload': False,
-                'config_reload_interval': 60  # 秒
-            }
-        }
+        # 默认配置（模块级只读模板，需要可修改的副本时使用 _fresh_default_config）
+        self.default_config = _DEFAULT_CONFIG_TEMPLATE
         
         # 加载配置
         self.load()
@@ -199,8 +303,9 @@ class Config:
         observer : Callable[[Dict], None]
             当配置变更时要调用的回调函数，接收当前配置字典作为参数
         """
-        if observer not in self._observers:
-            self._observers.append(observer)
+        entry = self._observer_entry(observer)
+        if entry not in self._observers:
+            self._observers.append(entry)
             self.logger.debug(f"已注册配置观察者: {observer.__name__}")
     
     def unregister_observer(self, observer: Callable[[Dict], None]) -> None:
@@ -212,31 +317,87 @@ class Config:
         observer : Callable[[Dict], None]
             要注销的观察者函数
         """
-        if observer in self._observers:
-            self._observers.remove(observer)
+        entry = self._observer_entry(observer)
+        if entry in self._observers:
+            self._observers.remove(entry)
             self.logger.debug(f"已注销配置观察者: {observer.__name__}")
     
+    @staticmethod
+    def _observer_entry(observer: Callable[[Dict], None]) -> Any:
+        """观察者在列表中的保存形式：绑定方法转为弱引用"""
+        return weakref.WeakMethod(observer) if inspect.ismethod(observer) else observer
+    
+    def _invalidate_cache(self) -> None:
+        """配置内容变化后清空查询缓存"""
+        self._cache_gen += 1
+        self._get_cache.clear()
+    
     def notify_observers(self) -> None:
-        """通知所有观察者配置已更新"""
-        for observer in self._observers:
+        """
+        通知所有观察者配置已更新
+        
+        在持锁时清空缓存并取得观察者快照，回调本身在锁外同步执行，
+        观察者在回调中读写配置或注销自身都不会死锁。
+        """
+        with self._lock:
+            self._invalidate_cache()
+            observers = []
+            for entry in tuple(self._observers):
+                if isinstance(entry, weakref.WeakMethod):
+                    observer = entry()
+                    if observer is None:
+                        # 所属对象已被回收，移除失效的弱引用
+                        self._observers.remove(entry)
+                        continue
+                else:
+                    observer = entry
+                observers.append(observer)
+            config = self.config
+        
+        for observer in observers:
             try:
-                observer(self.config)
+                observer(config)
             except Exception as e:
                 self.logger.error(f"通知观察者 {observer.__name__} 时出错: {str(e)}")
     
     def start_watching(self) -> None:
         """开始监控配置文件变化"""
-        if self._watch_thread is not None and self._watch_thread.is_alive():
+        if self._is_watching():
             self.logger.warning("配置监控线程已在运行")
             return
         
+        if Observer is not None:
+            try:
+                watch_dir = os.path.dirname(os.path.abspath(self.config_file))
+                observer = Observer()
+                observer.schedule(_ConfigFileChangeHandler(self), watch_dir, recursive=False)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+                self.logger.info(f"开始监控配置文件 {self.config_file}")
+                return
+            except Exception as e:
+                self.logger.debug(f"启动配置文件监听失败，改用轮询: {str(e)}")
+        
         self._stop_watching.clear()
         self._watch_thread = threading.Thread(target=self._watch_config_file, daemon=True)
         self._watch_thread.start()
         self.logger.info(f"开始监控配置文件 {self.config_file}")
     
+    def _is_watching(self) -> bool:
+        """是否正在监控配置文件变化"""
+        return (self._observer is not None and self._observer.is_alive()) or \
+            (self._watch_thread is not None and self._watch_thread.is_alive())
+    
     def stop_watching(self) -> None:
         """停止监控配置文件变化"""
+        if self._observer is not None and self._observer.is_alive():
+            self._observer.stop()
+            self._observer.join(timeout=1.0)
+            self._observer = None
+            self.logger.info("停止监控配置文件")
+            return
+        
         if self._watch_thread is None or not self._watch_thread.is_alive():
             self.logger.warning("配置监控线程未在运行")
             return
@@ -245,19 +406,39 @@ class Config:
         self._watch_thread.join(timeout=1.0)
         self.logger.info("停止监控配置文件")
     
+    def _reload_if_modified(self) -> None:
+        """配置文件内容相比上次加载/保存有变化时重新加载，并通知观察者"""
+        try:
+            if os.path.exists(self.config_file):
+                st = os.stat(self.config_file)
+                if (st.st_mtime, st.st_size) == self._file_state:
+                    return
+                
+                # 修改时间或大小变化时再比较内容，只是被touch则不重新解析
+                with open(self.config_file, 'rb') as f:
+                    raw = f.read()
+                if zlib.crc32(raw) == self._content_crc:
+                    self._file_state = (st.st_mtime, st.st_size)
+                    self.last_modified_time = st.st_mtime
+                    return
+                
+                self.logger.info(f"检测到配置文件 {self.config_file} 已更改，重新加载")
+                self.load()
+                self.notify_observers()
+        except Exception as e:
+            self.logger.error(f"监控配置文件时出错: {str(e)}")
+    
+    def _remember_file_state(self, raw: bytes) -> None:
+        """记录配置文件当前的修改时间、大小及内容CRC32"""
+        st = os.stat(self.config_file)
+        self.last_modified_time = st.st_mtime
+        self._file_state = (st.st_mtime, st.st_size)
+        self._content_crc = zlib.crc32(raw)
+    
     def _watch_config_file(self) -> None:
-        """监控配置文件变化的线程函数"""
+        """监控配置文件变化的线程函数（watchdog不可用时的轮询回退）"""
         while not self._stop_watching.is_set():
-            try:
-                if os.path.exists(self.config_file):
-                    mtime = os.path.getmtime(self.config_file)
-                    if mtime > self.last_modified_time:
-                        self.logger.info(f"检测到配置文件 {self.config_file} 已更改，重新加载")
-                        self.load()
-                        self.notify_observers()
-                        self.last_modified_time = mtime
-            except Exception as e:
-                self.logger.error(f"监控配置文件时出错: {str(e)}")
+            self._reload_if_modified()
             
             # 等待指定时间间隔，或直到收到停止信号
             self._stop_watching.wait(self._watch_interval)
@@ -271,48 +452,68 @@ class Config:
         bool
             是否加载成功
         """
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-                self.logger.info(f"已从 {self.config_file} 加载配置")
-                self.last_modified_time = os.path.getmtime(self.config_file)
-                
-                # 自动升级旧版配置
-                if "meta" not in self.config or "version" not in self.config["meta"]:
+        with self._lock:
+            self._invalidate_cache()
+            try:
+                if os.path.exists(self.config_file):
+                    with open(self.config_file, 'rb') as f:
+                        raw = f.read()
+                    self.config = _loads(raw)
+                    self._invalidate_cache()
+                    self.logger.info(f"已从 {self.config_file} 加载配置")
+                    self._remember_file_state(raw)
+                    
+                    # 自动升级旧版配置（缺少版本号或版本低于当前版本时）
                     self._upgrade_config()
-                
-                # 检查是否应该自动监控配置变更
-                if self.get('app.config_auto_reload', False):
-                    self._watch_interval = self.get('app.config_reload_interval', 60)
-                    self.start_watching()
                     
-                return True
-            else:
-                self.logger.warning(f"配置文件 {self.config_file} 不存在，使用默认配置")
-                self.config = self.default_config
-                # 尝试创建默认配置文件
-                self.save()
+                    # 检查是否应该自动监控配置变更
+                    if self.get('app.config_auto_reload', False):
+                        self._watch_interval = self.get('app.config_reload_interval', 60)
+                        self.start_watching()
+                        
+                    return True
+                else:
+                    self.logger.warning(f"配置文件 {self.config_file} 不存在，使用默认配置")
+                    self.config = _fresh_default_config()
+                    # 尝试创建默认配置文件
+                    self.save()
+                    return False
+            except Exception as e:
+                self.logger.error(f"加载配置失败: {str(e)}")
+                self.config = _fresh_default_config()
+                self._invalidate_cache()
                 return False
-        except Exception as e:
-            self.logger.error(f"加载配置失败: {str(e)}")
-            self.config = self.default_config.copy()
-            return False
     
     def _upgrade_config(self) -> None:
         """升级老版本配置到最新版本，填充缺失的字段"""
-        self.logger.info("检测到旧版本配置文件，正在升级...")
-        
-        # 深度合并，保留用户自定义的值
-        updated_config = self._deep_merge(self.default_config, self.config)
-        
-        # 更新元数据
-        updated_config["meta"] = self.default_config["meta"].copy()
-        updated_config["meta"]["last_updated"] = datetime.now().isoformat()
-        
-        self.config = updated_config
-        self.save()
-        self.logger.info("配置升级完成")
+        with self._lock:
+            # 只有缺少版本号或版本低于当前版本时才合并；版本相同说明已是最新结构，
+            # 版本更高（由新版程序写入）或无法解析时保持文件原样
+            meta = self.config.get("meta")
+            if isinstance(meta, dict) and "version" in meta:
+                current = _parse_version(_DEFAULT_CONFIG_TEMPLATE["meta"]["version"])
+                version = _parse_version(meta["version"])
+                if version is None:
+                    self.logger.warning(f"无法识别配置文件版本 {meta['version']!r}，跳过升级")
+                    return
+                if version > current:
+                    self.logger.info(f"配置文件版本 {meta['version']} 高于当前版本，跳过升级")
+                if version >= current:
+                    return
+            
+            self.logger.info("检测到旧版本配置文件，正在升级...")
+            
+            # 深度合并，保留用户自定义的值
+            updated_config = self._deep_merge(self.default_config, self.config)
+            
+            # 更新元数据
+            updated_config["meta"] = self.default_config["meta"].copy()
+            updated_config["meta"]["last_updated"] = datetime.now().isoformat()
+            
+            self.config = updated_config
+            self._invalidate_cache()
+            self.save()
+            self.logger.info("配置升级完成")
     
     def _deep_merge(self, default_dict: Dict, user_dict: Dict) -> Dict:
         """
@@ -330,13 +531,17 @@ class Config:
         Dict
             合并后的字典
         """
-        result = default_dict.copy()
+        # 一次深拷贝默认字典，再用显式栈逐层原地合并，避免递归与每层的浅拷贝
+        result = copy.deepcopy(default_dict)
+        stack = [(result, user_dict)]
         
-        for key, value in user_dict.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
         
         return result
     
@@ -349,25 +554,40 @@ class Config:
         bool
             是否保存成功
         """
-        try:
-            # 更新最后修改时间
-            if "meta" in self.config:
-                self.config["meta"]["last_updated"] = datetime.now().isoformat()
-            
-            # 确保目录存在
-            config_dir = os.path.dirname(self.config_file)
-            if config_dir and not os.path.exists(config_dir):
-                os.makedirs(config_dir)
+        with self._lock:
+            try:
+                # 更新最后修改时间
+                if "meta" in self.config:
+                    self.config["meta"]["last_updated"] = datetime.now().isoformat()
                 
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=4)
-            
-            self.last_modified_time = os.path.getmtime(self.config_file)
-            self.logger.info(f"已将配置保存到 {self.config_file}")
-            return True
-        except Exception as e:
-            self.logger.error(f"保存配置失败: {str(e)}")
-            return False
+                # 确保目录存在
+                config_dir = os.path.dirname(self.config_file)
+                if config_dir and not os.path.exists(config_dir):
+                    os.makedirs(config_dir)
+                    
+                raw = _dumps(self.config)
+                # 先记录内容CRC：替换文件触发的监听事件据此识别为自身写入，不会重新加载
+                self._content_crc = zlib.crc32(raw)
+                
+                # 原子写入：写临时文件并落盘后再替换，写入中断不会留下损坏的配置文件
+                tmp_file = self.config_file + '.tmp'
+                try:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(raw)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_file, self.config_file)
+                except BaseException:
+                    if os.path.exists(tmp_file):
+                        os.remove(tmp_file)
+                    raise
+                
+                self._remember_file_state(raw)
+                self.logger.info(f"已将配置保存到 {self.config_file}")
+                return True
+            except Exception as e:
+                self.logger.error(f"保存配置失败: {str(e)}")
+                return False
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -385,16 +605,36 @@ class Config:
         Any
             配置项值
         """
+        # 读取不加锁：先记下缓存代数，再取当前配置字典的引用，并发load替换self.config时不会遍历到一半的新旧字典
+        gen = self._cache_gen
+        cfg = self.config
+        
+        # 非嵌套键直接查找顶层字典
+        if '.' not in key:
+            value = cfg.get(key, _SENTINEL)
+            return default if value is _SENTINEL else value
+        
+        # 命中缓存时只需一次字典查找
+        if key in self._get_cache:
+            return self._get_cache[key]
+        
         # 处理嵌套键
-        keys = key.split('.')
-        value = self.config
+        keys = _split(key)
+        value = cfg
         
         for k in keys:
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
+                # 不缓存缺失的键，避免默认值污染缓存
                 return default
         
+        if len(self._get_cache) >= _GET_CACHE_SIZE:
+            self._get_cache.pop(next(iter(self._get_cache), None), None)
+        self._get_cache[key] = value
+        # 查找期间缓存已被清空（配置已变更）时撤回刚写入的结果，避免旧值被永久返回
+        if self._cache_gen != gen:
+            self._get_cache.pop(key, None)
         return value
     
     def set(self, key: str, value: Any, save_to_file: bool = False) -> None:
@@ -410,27 +650,34 @@ class Config:
         save_to_file : bool, optional
             是否立即保存到文件，默认False
         """
-        # 处理嵌套键
-        keys = key.split('.')
-        config = self.config
-        
-        # 处理中间键
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            elif not isinstance(config[k], dict):
-                config[k] = {}
+        with self._lock:
+            if '.' not in key:
+                # 非嵌套键直接设置顶层值
+                self.config[key] = value
+            else:
+                # 处理嵌套键
+                keys = _split(key)
+                config = self.config
+                
+                # 处理中间键
+                for k in keys[:-1]:
+                    if k not in config:
+                        config[k] = {}
+                    elif not isinstance(config[k], dict):
+                        config[k] = {}
+                    
+                    config = config[k]
+                
+                # 设置最后一个键的值
+                config[keys[-1]] = value
+            # 修改完成后再清空缓存，之后的查询不会缓存修改前的值
+            self._invalidate_cache()
+            self.logger.debug(f"已设置配置项 {key} = {value}")
             
-            config = config[k]
-        
-        # 设置最后一个键的值
-        config[keys[-1]] = value
-        self.logger.debug(f"已设置配置项 {key} = {value}")
-        
-        if save_to_file:
-            self.save()
+            if save_to_file:
+                self.save()
     
-    def get_section(self, section: str) -> Dict[str, Any]:
+    def get_section(self, section: str) -> Mapping[str, Any]:
         """
         获取配置的整个部分
         
@@ -441,7 +688,7 @@ class Config:
             
         Returns:
         --------
-        Dict[str, Any]
+        Mapping[str, Any]
             配置部分，如果不存在则返回空字典
         """
         section_data = self.get(section, {})
@@ -453,10 +700,12 @@ class Config:
         """
         重置为默认配置
         """
-        self.config = self.default_config.copy()
-        self.logger.info("已重置为默认配置")
+        with self._lock:
+            self.config = _fresh_default_config()
+            self._invalidate_cache()
+            self.logger.info("已重置为默认配置")
         
-        # 通知观察者
+        # 通知观察者（在锁外执行回调）
         self.notify_observers()
     
     def __getitem__(self, key: str) -> Any:
@@ -473,17 +722,17 @@ class Config:
     
     def __contains__(self, key: str) -> bool:
         """
-        检查配置项是否存在
+        检查配置项是否存在（值为None的配置项同样视为存在）
         """
-        return self.get(key) is not None
+        return self.get(key, _SENTINEL) is not _SENTINEL
         
-    def get_all(self) -> Dict[str, Any]:
+    def get_all(self) -> Mapping[str, Any]:
         """
-        获取所有配置
+        获取所有配置的只读视图
         
         Returns:
         --------
-        Dict[str, Any]
-            所有配置
+        Mapping[str, Any]
+            所有配置（只读，修改请使用set方法）
         """
-        return self.config.copy() 
\ No newline at end of file
+        return MappingProxyType(self.config)
\ No newline at end of file
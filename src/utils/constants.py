@@ -5,20 +5,43 @@
 常量定义文件，集中管理项目中的所有常量
 """
 
-# 数据源类型
-class DataSourceType:
+import sys
+from enum import Enum
+
+try:
+    from enum import StrEnum
+except ImportError:
+    # Python 3.11之前没有StrEnum，提供行为一致的简单实现
+    class StrEnum(str, Enum):
+        def __str__(self) -> str:
+            return self.value
+
+        def __format__(self, format_spec: str) -> str:
+            return self.value.__format__(format_spec)
+
+
+def _intern_strings(cls):
+    """驻留类中所有字符串常量，使作为字典键、列名比较时可按引用快速判等"""
+    for name, value in list(vars(cls).items()):
+        if not name.startswith('_') and isinstance(value, str):
+            setattr(cls, name, sys.intern(value))
+    return cls
+
+# 数据源类型（StrEnum成员用作配置键、列名等需要普通字符串的地方时取 .value）
+class DataSourceType(StrEnum):
     BANK = "bank"
     ALIPAY = "alipay"
     WECHAT = "wechat"
     CALL = "call"
 
 # 交易类型
-class TransactionType:
+class TransactionType(StrEnum):
     TRANSFER = "转账"
     DEPOSIT = "存现"
     WITHDRAW = "取现"
 
 # 借贷标识
+@_intern_strings
 class DirectionFlag:
     # 银行标识
     BANK_CREDIT = "贷"  # 收入
@@ -33,7 +56,7 @@ class DirectionFlag:
     WECHAT_DEBIT = "出"
 
 # 列名
-class ColumnName:
+class ColumnName(StrEnum):
     # 通用列名
     NAME = "本方姓名"
     DATE = "交易日期"
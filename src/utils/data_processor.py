@@ -10,6 +10,71 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Union, Any
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+# 可选依赖pyarrow导入耗时较长，由 _load_optional_backends 在首次用到时加载：
+# - pyarrow：字符串列的首尾空白由Arrow内核去除（执行期间释放GIL，可按列并行），高基数文本列存为Arrow字符串
+pa = None
+pc = None
+# 高基数文本列使用的Arrow大字符串类型（pandas>=1.5提供ArrowDtype），随pyarrow一起加载
+_ARROW_STRING_DTYPE = None
+_OPTIONAL_BACKENDS_LOADED = False
+
+# pandas>=2.2公开了guess_datetime_format，旧版本从内部模块导入
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    try:
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    except ImportError:
+        guess_datetime_format = None
+
+# 推断日期格式时抽样的非空值个数
+_DATE_FORMAT_SAMPLE = 64
+
+# pandas>=3默认写时复制并弃用merge的copy参数，仅旧版本显式传入copy=False
+_MERGE_NO_COPY = {'copy': False} if int(pd.__version__.split('.')[0]) < 3 else {}
+
+# 单键分组可走排序+reduceat快速路径的聚合方式
+_FAST_AGG_FUNCS = frozenset({'sum', 'mean', 'min', 'max', 'count'})
+
+# 文本列唯一值占行数的比例低于此值时才转换为category
+_CATEGORY_MAX_RATIO = 0.5
+
+# 按列名缓存上次构建的category类型：同一结构的数据分批优化时直接复用，
+# 只有出现新取值时才重新构建
+_CAT_CACHE: Dict[Any, pd.CategoricalDtype] = {}
+_CAT_CACHE_SIZE = 256
+
+# category编码可能使用的有符号整数类型（由小到大）
+_CODE_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _load_optional_backends() -> None:
+    """首次调用时导入可选依赖，未安装的保持为None"""
+    global pa, pc, _ARROW_STRING_DTYPE, _OPTIONAL_BACKENDS_LOADED
+    if _OPTIONAL_BACKENDS_LOADED:
+        return
+    
+    try:
+        import pyarrow as _pa
+        import pyarrow.compute as _pc
+        pa, pc = _pa, _pc
+        if hasattr(pd, 'ArrowDtype'):
+            _ARROW_STRING_DTYPE = pd.ArrowDtype(pa.large_string())
+    except ImportError:
+        pass
+    
+    _OPTIONAL_BACKENDS_LOADED = True
+
+
+def _is_text_dtype(dtype: Any) -> bool:
+    """object、category或Arrow字符串类型视为文本列"""
+    if dtype == object or isinstance(dtype, pd.CategoricalDtype):
+        return True
+    _load_optional_backends()
+    return (_ARROW_STRING_DTYPE is not None and isinstance(dtype, pd.ArrowDtype)
+            and (pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)))
 
 
 class DataProcessor:
@@ -45,33 +110,103 @@ class DataProcessor:
         if df.empty:
             return df
         
-        # 优化数值类型
-        for col in df.select_dtypes(include=[np.number]).columns:
-            if df[col].dtype == 'int64':
-                if df[col].min() >= 0:
-                    if df[col].max() < 255:
-                        df[col] = df[col].astype('uint8')
-                    elif df[col].max() < 65535:
-                        df[col] = df[col].astype('uint16')
-                    elif df[col].max() < 4294967295:
-                        df[col] = df[col].astype('uint32')
-                else:
-                    if df[col].min() > -128 and df[col].max() < 127:
-                        df[col] = df[col].astype('int8')
-                    elif df[col].min() > -32768 and df[col].max() < 32767:
-                        df[col] = df[col].astype('int16')
-                    elif df[col].min() > -2147483648 and df[col].max() < 2147483647:
-                        df[col] = df[col].astype('int32')
-            elif df[col].dtype == 'float64':
-                df[col] = pd.to_numeric(df[col], downcast='float')
-        
-        # 优化字符串类型
-        for col in df.select_dtypes(include=['object']).columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].astype('category')
+        _load_optional_backends()
+        numeric_columns = df.select_dtypes(include=[np.number]).columns
+        object_columns = df.select_dtypes(include=['object']).columns
+        # 数值列均已不超过4字节且没有文本列时无可优化
+        if len(object_columns) == 0 and all(df[col].dtype.itemsize <= 4 for col in numeric_columns):
+            return df
+        
+        sizes = df.memory_usage(deep=True, index=False)
+        total_before = int(sizes.sum())
+        
+        # 转换后的列先收集起来，最后一次性重建数据框，避免逐列赋值引起的块拆分与复制
+        new_cols: Dict[Any, Any] = {}
+        
+        # 优化数值类型（只在类型确实变窄时写回列）
+        for col in numeric_columns:
+            s = df[col]
+            if s.dtype == 'int64':
+                # 交给pandas在C层选择能容纳全部取值的最小整数类型
+                downcast = 'unsigned' if s.min() >= 0 else 'integer'
+                converted = pd.to_numeric(s, downcast=downcast)
+                if converted.dtype.itemsize < s.dtype.itemsize:
+                    new_cols[col] = converted.to_numpy()
+            elif s.dtype == 'float64':
+                arr = s.to_numpy()
+                finite = arr[np.isfinite(arr)]
+                f32 = np.finfo(np.float32)
+                if finite.size == 0 or (finite.min() >= f32.min and finite.max() <= f32.max):
+                    downcast = arr.astype(np.float32)
+                    # 与pd.to_numeric(downcast='float')一致：转换会损失精度（如金额）时保留float64
+                    if np.allclose(downcast, arr, rtol=0, equal_nan=True):
+                        new_cols[col] = downcast
+        
+        # 优化字符串类型：仅对重复值较多的列转换为category；
+        # 唯一值占比高的列（如流水号）转换为category反而更占内存，可用pyarrow时改存为Arrow字符串
+        n_rows = len(df)
+        for col in object_columns:
+            s = df[col]
+            nunique = s.nunique(dropna=False)
+            if nunique >= n_rows * _CATEGORY_MAX_RATIO:
+                if _ARROW_STRING_DTYPE is not None:
+                    try:
+                        new_cols[col] = s.astype(_ARROW_STRING_DTYPE)
+                    except (TypeError, ValueError, pa.ArrowException):
+                        # 混有非字符串元素的列保持object
+                        pass
+                continue
+            # 预估category大小：编码数组 + 按平均长度估算的唯一值字符串
+            code_size = next(
+                np.dtype(dt).itemsize for dt in _CODE_DTYPES if nunique <= np.iinfo(dt).max
+            )
+            cat_size = n_rows * code_size + sizes[col] * nunique / n_rows
+            if cat_size < sizes[col]:
+                new_cols[col] = DataProcessor._to_categorical(col, s)
         
+        if new_cols:
+            df = pd.DataFrame(
+                {col: new_cols[col] if col in new_cols else df[col] for col in df.columns},
+                index=df.index,
+                copy=False,
+            )
+        
+        logger = logging.getLogger(__name__)
+        if logger.isEnabledFor(logging.DEBUG):
+            total_after = int(df.memory_usage(deep=True, index=False).sum())
+            logger.debug(f"DataFrame内存优化: {total_before} -> {total_after} 字节")
         return df
     
+    @staticmethod
+    def _to_categorical(col: Any, s: pd.Series) -> pd.Categorical:
+        """
+        将文本列转换为Categorical，优先复用该列名缓存的category类型
+        
+        Parameters:
+        -----------
+        col : Any
+            列名（缓存键）
+        s : pd.Series
+            文本列
+            
+        Returns:
+        --------
+        pd.Categorical
+            转换结果
+        """
+        cached = _CAT_CACHE.get(col)
+        if cached is not None:
+            cat = pd.Categorical(s, dtype=cached)
+            # 所有非空值都落在已缓存的类别中时可直接使用
+            if np.count_nonzero(cat.codes == -1) == s.isna().sum():
+                return cat
+        
+        cat = pd.Categorical(s)
+        if col not in _CAT_CACHE and len(_CAT_CACHE) >= _CAT_CACHE_SIZE:
+            _CAT_CACHE.pop(next(iter(_CAT_CACHE)))
+        _CAT_CACHE[col] = cat.dtype
+        return cat
+    
     @staticmethod
     def safe_date_conversion(series: pd.Series, format: str = 'mixed') -> pd.Series:
         """
@@ -89,11 +224,54 @@ class DataProcessor:
         pd.Series
             转换后的日期序列
         """
-        try:
-            return pd.to_datetime(series, errors='coerce', format=format)
-        except Exception:
-            # 如果指定格式失败，尝试自动推断
-            return pd.to_datetime(series, errors='coerce')
+        if format == 'mixed':
+            fmt = DataProcessor._infer_date_format(series)
+            if fmt is not None:
+                # 按推断出的单一格式整列解析（Cython快速路径）
+                parsed = pd.to_datetime(series, errors='coerce', format=fmt)
+                # 样本之外的值可能是其他格式，仅对解析失败的值再逐个推断
+                failed = parsed.isna() & series.notna()
+                if failed.any():
+                    parsed[failed] = pd.to_datetime(series[failed], errors='coerce', format='mixed')
+                return parsed
+        
+        # errors='coerce'时解析失败的值返回NaT而不会抛出异常
+        parsed = pd.to_datetime(series, errors='coerce', format=format)
+        if format != 'mixed' and len(series):
+            # 指定格式与数据不符（多数非空值解析失败）时改为自动推断
+            nat_ratio = parsed.isna().mean()
+            if nat_ratio > 0.5 and nat_ratio > series.isna().mean():
+                parsed = pd.to_datetime(series, errors='coerce', format='mixed')
+        return parsed
+    
+    @staticmethod
+    def _infer_date_format(series: pd.Series) -> Optional[str]:
+        """
+        根据前若干个非空字符串值推断统一的日期格式
+        
+        Parameters:
+        -----------
+        series : pd.Series
+            日期字符串序列
+            
+        Returns:
+        --------
+        Optional[str]
+            所有样本推断结果一致时返回该格式，否则为None
+        """
+        if guess_datetime_format is None or series.dtype != object:
+            return None
+        
+        sample = series.iloc[:_DATE_FORMAT_SAMPLE * 4].dropna().iloc[:_DATE_FORMAT_SAMPLE]
+        formats = set()
+        for value in sample:
+            if not isinstance(value, str):
+                return None
+            formats.add(guess_datetime_format(value))
+            if len(formats) > 1:
+                return None
+        
+        return formats.pop() if formats else None
     
     @staticmethod
     def batch_process_dataframe(df: pd.DataFrame, 
@@ -125,7 +303,42 @@ class DataProcessor:
             processed_batch = process_func(batch)
             results.append(processed_batch)
         
-        return pd.concat(results, ignore_index=True)
+        return DataProcessor._concat_batches(results)
+    
+    @staticmethod
+    def _concat_batches(results: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        拼接批处理结果
+        
+        各批次列名与类型完全一致且均为numpy类型时，逐列np.concatenate后一次性构建
+        数据框，避免pd.concat的块合并与额外复制；否则退回pd.concat。
+        
+        Parameters:
+        -----------
+        results : List[pd.DataFrame]
+            各批次的处理结果
+            
+        Returns:
+        --------
+        pd.DataFrame
+            拼接后的数据框（索引重置）
+        """
+        first = results[0]
+        columns = first.columns
+        dtypes = first.dtypes
+        uniform = (
+            columns.is_unique
+            and all(isinstance(dtype, np.dtype) for dtype in dtypes)
+            and all(b.columns.equals(columns) and b.dtypes.equals(dtypes) for b in results[1:])
+        )
+        if not uniform:
+            return pd.concat(results, ignore_index=True, copy=False)
+        
+        data = {
+            col: np.concatenate([b[col].to_numpy(copy=False) for b in results])
+            for col in columns
+        }
+        return pd.DataFrame(data, columns=columns, copy=False)
     
     @staticmethod
     def validate_dataframe(df: pd.DataFrame, 
@@ -190,12 +403,94 @@ class DataProcessor:
             # 过滤聚合字典
             filtered_agg_dict = {col: agg_dict[col] for col in agg_columns}
             
+            # 单键的sum/mean/min/max/count聚合直接在排序后的numpy数组上分段归约
+            if len(group_keys) == 1:
+                result = DataProcessor._sorted_groupby_agg(df, group_keys[0], filtered_agg_dict)
+                if result is not None:
+                    return result
+            
             return df.groupby(group_keys).agg(filtered_agg_dict).reset_index()
         
         except Exception as e:
             logging.getLogger(__name__).error(f"分组聚合操作失败: {str(e)}")
             return pd.DataFrame()
     
+    @staticmethod
+    def _sorted_groupby_agg(df: pd.DataFrame,
+                            key: str,
+                            agg_dict: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        单分组键的快速聚合：按键稳定排序后用ufunc.reduceat逐段归约
+        
+        仅处理无缺失值的数值/布尔分组键与数值聚合列，聚合方式限于sum/mean/min/max/count，
+        缺失值处理与pandas一致（跳过NaN）；不满足条件时返回None，由调用方走常规groupby。
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            数据框
+        key : str
+            分组键
+        agg_dict : Dict[str, Any]
+            已过滤的聚合字典
+            
+        Returns:
+        --------
+        Optional[pd.DataFrame]
+            聚合结果（与groupby(...).agg(...).reset_index()一致），不适用时为None
+        """
+        if len(df) == 0 or key in agg_dict or not all(
+            isinstance(func, str) and func in _FAST_AGG_FUNCS for func in agg_dict.values()
+        ):
+            return None
+        
+        keys = df[key].to_numpy()
+        if keys.dtype.kind not in 'biuf' or (keys.dtype.kind == 'f' and np.isnan(keys).any()):
+            return None
+        columns = {col: df[col].to_numpy() for col in agg_dict}
+        if any(values.dtype.kind not in 'biuf' for values in columns.values()):
+            return None
+        
+        order = np.argsort(keys, kind='stable')
+        uniq, starts = np.unique(keys[order], return_index=True)
+        
+        data = {key: uniq}
+        for col, func in agg_dict.items():
+            values = columns[col][order]
+            dtype = values.dtype
+            if values.dtype.kind == 'f':
+                valid = ~np.isnan(values)
+            else:
+                valid = None
+            
+            if func in ('min', 'max'):
+                # fmin/fmax跳过NaN，整组均为NaN时结果为NaN
+                ufunc = np.fmin if func == 'min' else np.fmax
+                data[col] = ufunc.reduceat(values, starts)
+                continue
+            
+            count = (np.diff(np.append(starts, len(values))) if valid is None
+                     else np.add.reduceat(valid.astype(np.int64), starts))
+            if func == 'count':
+                data[col] = count.astype(np.int64, copy=False)
+                continue
+            
+            if valid is not None:
+                values = np.where(valid, values, values.dtype.type(0))
+            elif values.dtype.kind in 'bi':
+                values = values.astype(np.int64, copy=False)
+            elif values.dtype.kind == 'u':
+                values = values.astype(np.uint64, copy=False)
+            total = np.add.reduceat(values, starts)
+            if func == 'sum':
+                # 与pandas一致：整数列的和保持原类型（如int32），布尔列的和为int64
+                data[col] = total.astype(dtype, copy=False) if dtype.kind in 'iu' else total
+            else:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    data[col] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+        
+        return pd.DataFrame(data, columns=[key] + list(agg_dict), copy=False)
+    
     @staticmethod
     def merge_dataframes_safely(left_df: pd.DataFrame, 
                                right_df: pd.DataFrame, 
@@ -223,23 +518,61 @@ class DataProcessor:
         if left_df.empty or right_df.empty:
             return left_df if not left_df.empty else right_df
         
+        _load_optional_backends()
         try:
             # 检查合并键是否存在
             if isinstance(on, str):
                 on = [on]
             
+            # 合并键恰好是两侧的索引时直接按索引合并，省去把索引当作列处理的开销
+            if list(left_df.index.names) == on and list(right_df.index.names) == on:
+                return pd.merge(left_df, right_df, left_index=True, right_index=True, how=how)
+            
             missing_keys_left = set(on) - set(left_df.columns)
             missing_keys_right = set(on) - set(right_df.columns)
             
             if missing_keys_left or missing_keys_right:
                 return left_df
             
-            return pd.merge(left_df, right_df, on=on, how=how)
+            # 两侧键的类型不一致时先统一：数值键转为公共类型，一侧为Arrow类型时另一侧转为同一Arrow类型，
+            # 避免合并时逐次向上转换复制
+            left_casts, right_casts = {}, {}
+            for key in on:
+                left_dtype, right_dtype = left_df[key].dtype, right_df[key].dtype
+                if left_dtype == right_dtype:
+                    continue
+                if isinstance(left_dtype, np.dtype) and isinstance(right_dtype, np.dtype):
+                    if left_dtype.kind in 'iuf' and right_dtype.kind in 'iuf':
+                        common = np.result_type(left_dtype, right_dtype)
+                        if left_dtype != common:
+                            left_casts[key] = common
+                        if right_dtype != common:
+                            right_casts[key] = common
+                elif _ARROW_STRING_DTYPE is not None and isinstance(left_dtype, pd.ArrowDtype):
+                    right_casts[key] = left_dtype
+                elif _ARROW_STRING_DTYPE is not None and isinstance(right_dtype, pd.ArrowDtype):
+                    left_casts[key] = right_dtype
+            # 只替换键列，其余列仍共享原数据（浅拷贝），不复制整张表
+            left_df = DataProcessor._cast_columns(left_df, left_casts)
+            right_df = DataProcessor._cast_columns(right_df, right_casts)
+            
+            # 键类型一致后合并；pandas<3时显式copy=False，Arrow类型的列可直接复用底层数组
+            return pd.merge(left_df, right_df, on=on, how=how, sort=False, **_MERGE_NO_COPY)
         
         except Exception as e:
             logging.getLogger(__name__).error(f"DataFrame合并失败: {str(e)}")
             return left_df
     
+    @staticmethod
+    def _cast_columns(df: pd.DataFrame, casts: Dict[str, Any]) -> pd.DataFrame:
+        """对浅拷贝的数据框逐列转换类型，未转换的列不复制"""
+        if not casts:
+            return df
+        df = df.copy(deep=False)
+        for col, dtype in casts.items():
+            df[col] = df[col].astype(dtype)
+        return df
+    
     @staticmethod
     def extract_numeric_columns(df: pd.DataFrame) -> List[str]:
         """
@@ -272,7 +605,7 @@ class DataProcessor:
         List[str]
             文本列名列表
         """
-        return df.select_dtypes(include=['object', 'category']).columns.tolist()
+        return [col for col, dtype in df.dtypes.items() if _is_text_dtype(dtype)]
     
     @staticmethod
     def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
@@ -292,14 +625,57 @@ class DataProcessor:
         if df.empty:
             return df
         
-        # 移除完全空白的行
-        df = df.dropna(how='all')
+        _load_optional_backends()
         
-        # 移除完全空白的列
-        df = df.dropna(axis=1, how='all')
+        # 一次缺失值扫描同时得到完全空白的行和列，并一起移除
+        # 无需移除时也生成浅拷贝，后续列赋值不会修改调用方的数据框
+        mask = df.isna().to_numpy()
+        keep_rows = ~mask.all(axis=1)
+        keep_cols = ~mask.all(axis=0)
+        if keep_rows.all() and keep_cols.all():
+            df = df.copy(deep=False)
+        else:
+            df = df.iloc[keep_rows, keep_cols].copy(deep=False)
         
         # 清理字符串列的前后空格
-        for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].astype(str).str.strip()
+        text_columns = df.select_dtypes(include=['object']).columns
+        if pa is None:
+            for col in text_columns:
+                df[col] = df[col].astype(str).str.strip()
+            return df
+        
+        if len(text_columns) > 1:
+            with ThreadPoolExecutor(max_workers=min(4, len(text_columns))) as executor:
+                stripped = list(executor.map(lambda col: DataProcessor._strip_text(df[col]), text_columns))
+        else:
+            stripped = [DataProcessor._strip_text(df[col]) for col in text_columns]
+        for col, values in zip(text_columns, stripped):
+            df[col] = values
         
         return df
+    
+    @staticmethod
+    def _strip_text(series: pd.Series) -> np.ndarray:
+        """
+        用Arrow内核去除文本列各元素的首尾空白
+        
+        列中全部为字符串时直接构建Arrow数组；含缺失值或非字符串元素时先按原逻辑
+        astype(str)转换（缺失值变为'nan'/'None'），保证结果与str.strip()一致。
+        
+        Parameters:
+        -----------
+        series : pd.Series
+            object类型的文本列
+            
+        Returns:
+        --------
+        np.ndarray
+            去除首尾空白后的字符串数组（object类型）
+        """
+        try:
+            arr = pa.array(series.to_numpy(), type=pa.large_string(), from_pandas=True)
+            if arr.null_count:
+                raise TypeError("列中含缺失值")
+        except (TypeError, pa.ArrowException):
+            arr = pa.array(series.astype(str).to_numpy(), type=pa.large_string())
+        return pc.utf8_trim_whitespace(arr).to_numpy(zero_copy_only=False)